@@ -3,19 +3,25 @@
 # corporate events, top management, and subsidiaries, using APIs like SerpAPI, Wikipedia, and OpenRouter.
 
 import os
+import atexit
 import requests
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import quote
 from dotenv import load_dotenv
 import re
 from datetime import datetime
 import time
 import json
+import orjson
 from serpapi import GoogleSearch
 from searxng_crawler import scrape_website
 from searxng_db import store_subsidiaries
 from bs4 import BeautifulSoup
 import base64
 from typing import Optional, Dict, Any
+from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
@@ -48,6 +54,43 @@ try:
 except Exception:
     yf = None
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except Exception:
+    LexborHTMLParser = None
+
+try:
+    import diskcache
+except Exception:
+    diskcache = None
+
+# Persistent cache for slow-changing scrapes — Wikipedia pages, logos (survives restarts; optional).
+CACHE_DIR = os.getenv("CACHE_DIR", "./.cache")
+WIKI_CACHE_TTL = 7 * 24 * 3600
+LOGO_CACHE_TTL = 30 * 24 * 3600
+_SCRAPE_DISK_CACHE = (
+    diskcache.Cache(os.path.join(CACHE_DIR, "scrape"), size_limit=500 * 1024 * 1024)
+    if diskcache is not None
+    else None
+)
+
+# Shared keep-alive pool for the remaining sync requests calls (Wikipedia summary, logo sources).
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=Retry(total=2, backoff_factor=0.3)),
+)
+atexit.register(_HTTP_SESSION.close)
+
+# Pooled HTTP/2 client for Wikipedia article fetches (keep-alive across companies).
+WIKI_CLIENT = httpx.Client(base_url="https://en.wikipedia.org", http2=True, timeout=10, follow_redirects=True)
+atexit.register(WIKI_CLIENT.close)
+
+_HTTP_PREFIXES = ("http://", "https://")
+
+GENERIC_LOGO_URL = "https://www.google.com/s2/favicons?sz=128&domain_url=google.com"
+
+
 def fetch_logo_free(company_name: str):
     """
     Fetches a company's logo using 100% free and stable sources.
@@ -55,9 +98,34 @@ def fetch_logo_free(company_name: str):
         1️⃣ Wikipedia (Commons image)
         2️⃣ DuckDuckGo Images (scraped)
         3️⃣ Favicon generator
+    Hits are memoized in-process and on disk (LOGO_CACHE_TTL); the generic
+    fallback is never cached so a transient outage doesn't stick.
     Returns:
         str - Base64 data URI or working image URL.
     """
+    try:
+        return _fetch_logo_cached(company_name.strip())
+    except LookupError:
+        print(f"⚠️ No logo found, returning generic fallback for {company_name}")
+        return GENERIC_LOGO_URL
+
+
+@lru_cache(maxsize=1024)
+def _fetch_logo_cached(company_name: str) -> str:
+    key = f"logo:{company_name.lower()}"
+    if _SCRAPE_DISK_CACHE is not None:
+        hit = _SCRAPE_DISK_CACHE.get(key)
+        if hit is not None:
+            return hit
+
+    logo = _fetch_logo_uncached(company_name)
+    if _SCRAPE_DISK_CACHE is not None:
+        _SCRAPE_DISK_CACHE.set(key, logo, expire=LOGO_CACHE_TTL)
+    return logo
+
+
+def _fetch_logo_uncached(company_name: str) -> str:
+    """Tries each logo source in turn. Raises LookupError when all of them fail."""
     headers = {"User-Agent": "Mozilla/5.0"}
 
     # ---------------------------------------------
@@ -65,7 +133,7 @@ def fetch_logo_free(company_name: str):
     # ---------------------------------------------
     try:
         wiki_url = f"https://en.wikipedia.org/wiki/{company_name.replace(' ', '_')}"
-        r = requests.get(wiki_url, headers=headers, timeout=10)
+        r = _HTTP_SESSION.get(wiki_url, headers=headers, timeout=10)
         if r.status_code == 200:
             soup = BeautifulSoup(r.text, "html.parser")
             infobox = soup.select_one("table.infobox img")
@@ -73,7 +141,7 @@ def fetch_logo_free(company_name: str):
                 img_url = infobox["src"]
                 if img_url.startswith("//"):
                     img_url = "https:" + img_url
-                img_data = requests.get(img_url, headers=headers, timeout=10).content
+                img_data = _HTTP_SESSION.get(img_url, headers=headers, timeout=10).content
                 b64 = base64.b64encode(img_data).decode("utf-8")
                 mime = "image/png" if ".png" in img_url.lower() else "image/jpeg"
                 print(f"✅ Wikipedia logo found for {company_name}")
@@ -86,7 +154,7 @@ def fetch_logo_free(company_name: str):
     # ---------------------------------------------
     try:
         search_url = f"https://duckduckgo.com/html/?q={company_name.replace(' ', '+')}+logo"
-        r = requests.get(search_url, headers=headers, timeout=10)
+        r = _HTTP_SESSION.get(search_url, headers=headers, timeout=10)
         if r.status_code == 200:
             soup = BeautifulSoup(r.text, "html.parser")
             img_tags = soup.find_all("img")
@@ -97,7 +165,7 @@ def fetch_logo_free(company_name: str):
                         src = "https:" + src
                     elif src.startswith("/"):
                         src = "https://duckduckgo.com" + src
-                    img_data = requests.get(src, headers=headers, timeout=10).content
+                    img_data = _HTTP_SESSION.get(src, headers=headers, timeout=10).content
                     b64 = base64.b64encode(img_data).decode("utf-8")
                     mime = "image/png" if ".png" in src.lower() else "image/jpeg"
                     print(f"✅ DuckDuckGo logo found for {company_name}")
@@ -111,7 +179,7 @@ def fetch_logo_free(company_name: str):
     try:
         domain = company_name.lower().replace(" ", "") + ".com"
         favicon_url = f"https://www.google.com/s2/favicons?sz=128&domain_url={domain}"
-        r = requests.get(favicon_url, headers=headers, timeout=10)
+        r = _HTTP_SESSION.get(favicon_url, headers=headers, timeout=10)
         if r.status_code == 200:
             img_data = r.content
             b64 = base64.b64encode(img_data).decode("utf-8")
@@ -122,10 +190,9 @@ def fetch_logo_free(company_name: str):
         print(f"⚠️ Favicon fetch failed for {company_name}: {e}")
 
     # ---------------------------------------------
-    # If everything fails — use Google fallback
+    # If everything fails — caller uses Google fallback
     # ---------------------------------------------
-    print(f"⚠️ No logo found, returning generic fallback for {company_name}")
-    return "https://www.google.com/s2/favicons?sz=128&domain_url=google.com"
+    raise LookupError(company_name)
 
 
 def fetch_logo_from_google(company_name: str):
@@ -797,22 +864,30 @@ def get_wikipedia_summary(company_name):
     Returns:
         str: The Wikipedia summary extract, or empty string if not found or on error.
     """
-    # Set user-agent to avoid being blocked by Wikipedia
-    headers = {"User-Agent": "Mozilla/5.0"}
     try:
-        # Encode company name for URL safety
-        encoded_name = quote(company_name.replace('&', '%26'))
-        url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{encoded_name}"
-        # Send GET request to Wikipedia API
-        r = requests.get(url, headers=headers, timeout=5)
-        if r.status_code == 200:
-            data = r.json()
-            # Return extract if available and not a disambiguation page
-            if "extract" in data and data.get("type") != "disambiguation":
-                return data["extract"]
+        return _wikipedia_summary_cached(company_name)
     except Exception as e:
-        # Log error and return empty string if the request fails
+        # Log error and return empty string if the request fails (errors are not memoized)
         print(f"⚠️ Wikipedia fetch error: {e}")
+        return ""
+
+
+@lru_cache(maxsize=2048)
+def _wikipedia_summary_cached(company_name):
+    # Set user-agent to avoid being blocked by Wikipedia
+    headers = {"User-Agent": "Mozilla/5.0"}
+    # Encode company name for URL safety
+    encoded_name = quote(company_name.replace('&', '%26'))
+    url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{encoded_name}"
+    # Send GET request to Wikipedia API
+    r = _HTTP_SESSION.get(url, headers=headers, timeout=5)
+    if r.status_code == 200:
+        data = r.json()
+        # Return extract if available and not a disambiguation page
+        if "extract" in data and data.get("type") != "disambiguation":
+            return data["extract"]
+    elif r.status_code != 404:
+        r.raise_for_status()
     return ""
 
 # ============================================================
@@ -4088,7 +4163,7 @@ def generate_summary(company_name, text="", yahoo_data=None):
     # Extract domain/company name from URL if needed
     search_name = company_name
     website_from_input = ""
-    if company_name.startswith("http://") or company_name.startswith("https://"):
+    if company_name.startswith(_HTTP_PREFIXES):
         website_from_input = company_name
         from urllib.parse import urlparse
         parsed = urlparse(company_name)
@@ -4467,7 +4542,7 @@ Source text for reference:
     for line in summary.split("\n"):
         cleaned = line.lower().replace("–", "-").replace("—", "-").strip()
 
-        if cleaned.startswith("- ceo") or cleaned.startswith("ceo"):
+        if cleaned.startswith(("- ceo", "ceo")):
             final_lines.append(f"- CEO: {ceo}")
             ceo_replaced = True
         elif ("press page:" in cleaned or "press-page:" in cleaned) and press_page_url:
@@ -4860,44 +4935,225 @@ Now generate the company profile using ONLY the verified information below and a
 # ============================================================
 # 🔹 Subsidiary Data Generator
 # ============================================================
+_DOMAIN_RE = re.compile(r"^https?://(www\.)?")
+_TABLE_TAG_RE = re.compile(r"<(/?)table\b", re.I)
+_SUBS_MARKER = b"Subsidiaries"
+WIKI_SUBS_SCAN_BYTES = 512 * 1024
+
+
+SUBSIDIARY_PROMPT_TEMPLATE = """
+You are a professional corporate researcher.
+
+TASK:
+Using the Wikipedia list and online context, produce a structured JSON array of **current subsidiaries** of "{company_name}".
+Each subsidiary object must contain:
+- name
+- url
+- description
+- sector
+- linkedin_members
+- country
+- logo (use company favicon URL if possible)
+
+Wikipedia subsidiaries:
+{wiki_subs}
+
+Additional links:
+{serp_context}
+
+Return ONLY valid JSON array (no text, no comments).
+"""
+
+
+# Deletes every non-digit in Latin-1; rarer code points are left for the \D fallback
+_DIGITS_ONLY = str.maketrans("", "", "".join(chr(c) for c in range(256) if not chr(c).isdecimal()))
+
+
+def _extract_json_array(s: str) -> Optional[str]:
+    """
+    Returns the first balanced top-level JSON array in ``s`` (or None).
+    Single forward scan tracking bracket depth; brackets inside string literals are ignored.
+    """
+    start = s.find("[")
+    if start == -1:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(s)):
+        ch = s[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "[":
+            depth += 1
+        elif ch == "]":
+            depth -= 1
+            if depth == 0:
+                return s[start:i + 1]
+    return None
+
+
 def get_wikipedia_subsidiaries(company_name: str):
     """
     Attempts to extract subsidiaries directly from the company's Wikipedia page.
     Returns a list of subsidiary names if available.
+    Results are memoized in-process and on disk for WIKI_CACHE_TTL.
     """
     try:
-        url = f"https://en.wikipedia.org/wiki/{company_name.replace(' ', '_')}"
-        response = requests.get(url, timeout=10)
-        if response.status_code != 200:
+        return list(_wikipedia_subsidiaries_cached(company_name.strip()))
+    except Exception as e:
+        print(f"⚠️ Wikipedia subsidiary fetch failed: {e}")
+        return []
+
+
+@lru_cache(maxsize=1024)
+def _wikipedia_subsidiaries_cached(company_name: str) -> tuple:
+    """Disk-backed lookup; only successful fetches are cached (errors propagate)."""
+    key = f"wiki_subs:{company_name.lower().replace(' ', '_')}"
+    if _SCRAPE_DISK_CACHE is not None:
+        hit = _SCRAPE_DISK_CACHE.get(key)
+        if hit is not None:
+            return tuple(hit)
+
+    subsidiaries = _fetch_wikipedia_subsidiaries(company_name)
+    if _SCRAPE_DISK_CACHE is not None:
+        _SCRAPE_DISK_CACHE.set(key, subsidiaries, expire=WIKI_CACHE_TTL)
+    return tuple(subsidiaries)
+
+
+def _wikipedia_infobox_html(html: str) -> str:
+    """Slices out the ``<table class="infobox ...">`` element (nested tables included)."""
+    idx = html.find('class="infobox')
+    if idx == -1:
+        return ""
+    start = html.rfind("<table", 0, idx)
+    if start == -1:
+        return ""
+    depth = 0
+    for m in _TABLE_TAG_RE.finditer(html, start):
+        depth += -1 if m.group(1) else 1
+        if depth == 0:
+            return html[start:m.end()]
+    return html[start:]
+
+
+def _wikipedia_subsidiaries_section_html(html: str) -> str:
+    """Slices the body of the "Subsidiaries" section, up to the next ``<h2``."""
+    parts = html.split('id="Subsidiaries', 1)
+    if len(parts) < 2:
+        return ""
+    tail = parts[1]
+    end = tail.find("<h2")
+    return tail if end == -1 else tail[:end]
+
+
+def _fetch_wikipedia_subsidiaries(company_name: str) -> list:
+    """Fetches and parses the Wikipedia article. Raises on transport / server errors."""
+    with WIKI_CLIENT.stream("GET", f"/wiki/{company_name.replace(' ', '_')}") as response:
+        if response.status_code == 404:
+            return []
+        response.raise_for_status()
+
+        # Stream the body; if "Subsidiaries" hasn't shown up within the first
+        # WIKI_SUBS_SCAN_BYTES there's nothing to extract — skip the parse entirely.
+        buf = bytearray()
+        found = False
+        for chunk in response.iter_bytes():
+            buf += chunk
+            if not found:
+                found = buf.find(_SUBS_MARKER, max(0, len(buf) - len(chunk) - len(_SUBS_MARKER))) != -1
+                if not found and len(buf) > WIKI_SUBS_SCAN_BYTES:
+                    return []
+        if not found:
             return []
+        html = buf.decode(response.encoding or "utf-8", errors="replace")
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        subsidiaries = set()
+    # Articles are often 300+ KB; only the infobox and the "Subsidiaries"
+    # section matter, so hand just those slices to the HTML parser.
+    infobox_html = _wikipedia_infobox_html(html)
+    section_html = _wikipedia_subsidiaries_section_html(html)
+    # dict keeps first-seen order, so the list (and the prompt built from it) is deterministic
+    seen: Dict[str, None] = {}
 
+    if LexborHTMLParser is not None:
         # 1️⃣ Try infobox section
-        for row in soup.select("table.infobox tr"):
+        if infobox_html:
+            for row in LexborHTMLParser(infobox_html).css("table.infobox tr"):
+                header = row.css_first("th")
+                if header and "Subsidiaries" in header.text():
+                    for link in row.css("a"):
+                        text = link.text(strip=True)
+                        if not text or text in seen:
+                            continue
+                        if not text.startswith(("http", "#")):
+                            seen[text] = None
+
+        # 2️⃣ Try separate "Subsidiaries" headings
+        if section_html:
+            ul = LexborHTMLParser(section_html).css_first("ul")
+            if ul:
+                for li in ul.css("li"):
+                    text = li.text(strip=True)
+                    if text:
+                        seen.setdefault(text, None)
+
+        return list(seen)
+
+    # 1️⃣ Try infobox section
+    if infobox_html:
+        for row in BeautifulSoup(infobox_html, "lxml").select("table.infobox tr"):
             header = row.find("th")
             if header and "Subsidiaries" in header.text:
                 links = row.find_all("a")
                 for link in links:
-                    text = link.get_text(strip=True)
-                    if text and not text.startswith(("http", "#")):
-                        subsidiaries.add(text)
+                    # .string avoids a descendant walk for the usual single-text-node link
+                    text = link.string.strip() if link.string is not None else link.get_text(strip=True)
+                    if not text or text in seen:
+                        continue
+                    if not text.startswith(("http", "#")):
+                        seen[text] = None
 
-        # 2️⃣ Try separate "Subsidiaries" headings
-        for h2 in soup.find_all("h2"):
-            if "Subsidiaries" in h2.get_text():
-                ul = h2.find_next("ul")
-                if ul:
-                    for li in ul.find_all("li"):
-                        text = li.get_text(strip=True)
-                        if text:
-                            subsidiaries.add(text)
-
-        return list(subsidiaries)
+    # 2️⃣ Try separate "Subsidiaries" headings
+    if section_html:
+        ul = BeautifulSoup(section_html, "lxml").find("ul")
+        if ul:
+            for li in ul.find_all("li"):
+                text = li.string.strip() if li.string is not None else li.get_text(strip=True)
+                if text:
+                    seen.setdefault(text, None)
+
+    return list(seen)
+
+
+@lru_cache(maxsize=4096)
+def get_favicon(url):
+    try:
+        domain = _DOMAIN_RE.sub("", url).split("/")[0]
+        return f"https://www.google.com/s2/favicons?sz=64&domain_url={domain}"
+    except Exception:
+        return "https://www.google.com/s2/favicons?sz=64&domain_url=google.com"
+
+
+def _serp_fetch(query: str) -> list:
+    """SerpAPI organic result links for the subsidiary context (empty list on failure)."""
+    serp_results = []
+    try:
+        params = {"q": query, "hl": "en", "gl": "us", "num": 30, "api_key": SERPAPI_KEY, "output": "json"}
+        # Decode the raw body with orjson instead of get_dict()'s stdlib json pass.
+        raw = GoogleSearch(params).get_response().content
+        serp_data = orjson.loads(raw).get("organic_results") or []
+        serp_results = [r["link"] for r in serp_data if r.get("link")][:30]
+        print(f"✅ Found {len(serp_results)} possible subsidiary links from SerpAPI.")
     except Exception as e:
-        print(f"⚠️ Wikipedia subsidiary fetch failed: {e}")
-        return []
+        print(f"⚠️ SerpAPI subsidiary fetch failed: {e}")
+    return serp_results
 
 
 def generate_subsidiary_data(company_name: str, company_description: str = ""):
@@ -4908,93 +5164,89 @@ def generate_subsidiary_data(company_name: str, company_description: str = ""):
     print(f"🏢 Generating enriched subsidiary data for: {company_name}")
     subsidiaries = []
 
-    # Step 1️⃣: Wikipedia first
-    wiki_subs = get_wikipedia_subsidiaries(company_name)
+    # Step 1️⃣ + 2️⃣: Wikipedia and SerpAPI context are independent — fetch both at once
+    query = f"{company_name} subsidiaries OR child companies site:linkedin.com OR site:crunchbase.com OR site:craft.co OR site:wikipedia.org"
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        f_wiki = executor.submit(get_wikipedia_subsidiaries, company_name)
+        f_serp = executor.submit(_serp_fetch, query)
+        wiki_subs = f_wiki.result()
+        serp_results = f_serp.result()
+
     if wiki_subs:
         print(f"✅ Found {len(wiki_subs)} subsidiaries from Wikipedia: {wiki_subs[:8]}")
 
-    # Step 2️⃣: Gather broader context via SerpAPI
-    query = f"{company_name} subsidiaries OR child companies site:linkedin.com OR site:crunchbase.com OR site:craft.co OR site:wikipedia.org"
-    serp_results = []
-    try:
-        params = {"q": query, "hl": "en", "gl": "us", "num": 30, "api_key": SERPAPI_KEY}
-        search = GoogleSearch(params)
-        serp_data = search.get_dict().get("organic_results", [])
-        serp_results = [r.get("link") for r in serp_data if r.get("link")]
-        print(f"✅ Found {len(serp_results)} possible subsidiary links from SerpAPI.")
-    except Exception as e:
-        print(f"⚠️ SerpAPI subsidiary fetch failed: {e}")
-
     # Step 3️⃣: AI enrichment with Wikipedia + Serp context
-    serp_context = "\n".join(serp_results[:20])
-    prompt = f"""
-You are a professional corporate researcher.
-
-TASK:
-Using the Wikipedia list and online context, produce a structured JSON array of **current subsidiaries** of "{company_name}".
-Each subsidiary object must contain:
-- name
-- url
-- description
-- sector
-- linkedin_members
-- country
-- logo (use company favicon URL if possible)
-
-Wikipedia subsidiaries:
-{wiki_subs}
-
-Additional links:
-{serp_context}
-
-Return ONLY valid JSON array (no text, no comments).
-"""
+    prompt = SUBSIDIARY_PROMPT_TEMPLATE.format(
+        company_name=company_name,
+        wiki_subs="\n".join(wiki_subs[:40]),
+        serp_context="\n".join(serp_results[:20]),
+    )
 
     ai_response = openrouter_chat("anthropic/claude-3.5-sonnet", prompt, "Subsidiaries Extractor")
 
     try:
-        match = re.search(r'\[.*\]', ai_response, re.S)
-        if match:
-            subsidiaries = json.loads(match.group(0))
+        json_array = _extract_json_array(ai_response or "")
+        if json_array:
+            subsidiaries = orjson.loads(json_array)
             print(f"✅ Extracted {len(subsidiaries)} subsidiaries from AI model.")
     except Exception as e:
         print(f"⚠️ AI subsidiary JSON parse error: {e}")
         return []
 
     # Step 4️⃣: Logo guarantee + data cleaning
-    def get_favicon(url):
-        try:
-            domain = re.sub(r"^https?://(www\.)?", "", url).split("/")[0]
-            return f"https://www.google.com/s2/favicons?sz=64&domain_url={domain}"
-        except Exception:
-            return "https://www.google.com/s2/favicons?sz=64&domain_url=google.com"
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(_enrich_subsidiaries(subsidiaries, company_name))
+    else:
+        # Already inside an event loop (e.g. FastAPI) — run on a helper thread.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(asyncio.run, _enrich_subsidiaries(subsidiaries, company_name)).result()
 
-    for sub in subsidiaries:
-        # --- Ensure logo always exists ---
-        url = sub.get("url", "")
-        if url and not url.startswith("http"):
-            url = "https://" + url
-        sub["url"] = url
+    # ✅ Store using list-based DB interface — one insert for the whole batch
+    if subsidiaries:
+        try:
+            store_subsidiaries(company_name, subsidiaries, raise_errors=True)
+        except Exception as batch_err:
+            # Only a raised insert is retried: an empty response may follow a successful
+            # insert, and the table allows duplicates
+            print(f"⚠️ Batch subsidiary store failed ({batch_err}) — retrying row by row")
+            for sub in subsidiaries:
+                try:
+                    store_subsidiaries(company_name, [sub])
+                except Exception as db_err:
+                    print(f"⚠️ Database store error for {sub.get('name')}: {db_err}")
 
-        # ✅ Try fetching a real logo from Google first
-        if not sub.get("logo"):
-            sub["logo"] = fetch_logo_free(sub.get("name") or sub.get("url") or company_name)
+    return subsidiaries
 
 
+async def _enrich_subsidiary(sub: dict, company_name: str, sem: asyncio.Semaphore):
+    """Logo guarantee and data cleaning for one subsidiary."""
+    async with sem:
+        # --- Ensure logo always exists ---
+        url = sub.get("url") or ""
+        sub["url"] = url = "https://" + url if url and not url.startswith("http") else url
 
+        # ✅ Try fetching a real logo first; the subsidiary's own favicon beats the generic fallback
+        if not sub.get("logo"):
+            logo = await asyncio.to_thread(fetch_logo_free, sub.get("name") or url or company_name)
+            sub["logo"] = get_favicon(url) if url and logo == GENERIC_LOGO_URL else logo
 
         if not isinstance(sub.get("linkedin_members"), int):
+            digits = str(sub.get("linkedin_members") or "").translate(_DIGITS_ONLY)
             try:
-                sub["linkedin_members"] = int(re.sub(r"\D", "", str(sub["linkedin_members"]))) if sub.get("linkedin_members") else 0
-            except:
-                sub["linkedin_members"] = 0
+                sub["linkedin_members"] = int(digits) if digits else 0
+            except ValueError:
+                # Non-Latin-1 leftovers such as "—" in "1,200 — approx"
+                sub["linkedin_members"] = int(re.sub(r"\D", "", digits) or 0)
 
         sub["description"] = sub.get("description", "").strip()
 
-        # ✅ Store using list-based DB interface
-        try:
-            store_subsidiaries(company_name, [sub])
-        except Exception as db_err:
-            print(f"⚠️ Database store error for {sub.get('name')}: {db_err}")
 
-    return subsidiaries
\ No newline at end of file
+async def _enrich_subsidiaries(subsidiaries: list, company_name: str, max_concurrency: int = 20):
+    """
+    Runs the per-subsidiary logo fetch concurrently instead of one RTT after another.
+    The semaphore keeps us from flooding the logo sources on very long lists.
+    """
+    sem = asyncio.Semaphore(max_concurrency)
+    await asyncio.gather(*(_enrich_subsidiary(sub, company_name, sem) for sub in subsidiaries))
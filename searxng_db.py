@@ -121,10 +121,12 @@ def get_search_history():
 # ============================================================
 # 🔹 Company Subsidiaries Management
 # ============================================================
-def store_subsidiaries(company, subsidiaries):
+def store_subsidiaries(company, subsidiaries, raise_errors=False):
     """
     Always insert new subsidiary rows.
     Allows duplicates (useful for comparison and historical tracking).
+    With raise_errors=True a failed insert raises instead of returning False, so the
+    caller can tell it apart from an insert that succeeded with an empty response.
     """
     if not subsidiaries or not isinstance(subsidiaries, list):
         return
@@ -150,6 +152,8 @@ def store_subsidiaries(company, subsidiaries):
             print(f"⚠️ No response inserting subsidiaries for {company}")
             return False
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"⚠️ Failed to store subsidiaries for {company}: {e}")
         return False
 
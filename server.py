@@ -1,14 +1,24 @@
 import os
+import atexit
 import json
 import re
-import traceback
+import orjson
+import asyncio
+import hashlib
+import logging
+import threading
 import urllib.parse
+import uuid
+from collections import Counter, defaultdict
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
+from itertools import chain
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, AsyncIterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
@@ -23,11 +33,24 @@ from searxng_analyzer import (
     openrouter_chat,
     detect_ownership_from_description,
     enrich_with_yahoo_finance,
+    CACHE_DIR,
 )
 
 import requests
+import httpx
+from cachetools import TTLCache
 from bs4 import BeautifulSoup
 
+try:
+    import ahocorasick
+except Exception:
+    ahocorasick = None
+
+try:
+    import diskcache
+except Exception:
+    diskcache = None
+
 
 def _parse_openrouter_json(raw: str) -> dict:
     """
@@ -228,6 +251,9 @@ Return ONLY the JSON object, nothing else."""
 # ============================================================
 load_dotenv()
 
+# /analyze, /refresh_db and the Xano helpers log here; debug detail is only formatted when enabled
+logger = logging.getLogger(__name__)
+
 XANO_BASE_URL = "https://xdil-abvj-o7rq.e2.xano.io"
 XANO_EMAIL    = os.getenv("XANO_EMAIL", "").strip()
 XANO_PASSWORD = os.getenv("XANO_PASSWORD", "").strip()
@@ -272,7 +298,7 @@ _xano_token = _xano_login()
 # ============================================================
 # 🔹 FastAPI setup (placed early so routes can use `app`)
 # ============================================================
-app = FastAPI(title="SearXNG – Events UI (No Streamlit)")
+app = FastAPI(title="SearXNG – Events UI (No Streamlit)", default_response_class=ORJSONResponse)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 templates = Jinja2Templates(directory=os.path.join(BASE_DIR, "templates"))
@@ -282,17 +308,144 @@ if os.path.isdir(static_dir):
     app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
 
+# ============================================================
+# 🔹 AI result cache (overview, corporate events, top management per query)
+# ============================================================
+AI_CACHE_TTL = 24 * 3600
+# Part of every key: bump when prompts or models change so stale LLM output isn't served
+AI_CACHE_VERSION = "v1"
+
+# In-process layer in front of a disk layer, so warm entries survive restarts.
+# Entries are read from worker threads, hence the lock around the TTLCache.
+_AI_RESULT_CACHE: TTLCache = TTLCache(maxsize=2048, ttl=AI_CACHE_TTL)
+_AI_CACHE_LOCK = threading.Lock()
+_AI_DISK_CACHE = diskcache.Cache(os.path.join(CACHE_DIR, "ai")) if diskcache is not None else None
+if _AI_DISK_CACHE is not None:
+    atexit.register(_AI_DISK_CACHE.close)
+
+
+def _ai_cache_key(kind: str, query: str) -> str:
+    """Content-addressed key: same company URL/name (any scheme, www., case) -> same key."""
+    digest = hashlib.blake2b(_normalize_company_url_key(query).encode(), digest_size=16).hexdigest()
+    return f"{kind}:{AI_CACHE_VERSION}:{digest}"
+
+
+def _ai_cache_get(key: str) -> Any:
+    with _AI_CACHE_LOCK:
+        hit = _AI_RESULT_CACHE.get(key)
+    if hit is None and _AI_DISK_CACHE is not None:
+        try:
+            hit = _AI_DISK_CACHE.get(key)
+        except Exception as e:
+            print(f"[AI cache] disk read error: {e}")
+        if hit is not None:
+            with _AI_CACHE_LOCK:
+                _AI_RESULT_CACHE[key] = hit
+    return hit
+
+
+def _ai_cache_set(key: str, value: Any) -> None:
+    with _AI_CACHE_LOCK:
+        _AI_RESULT_CACHE[key] = value
+    if _AI_DISK_CACHE is not None:
+        try:
+            _AI_DISK_CACHE.set(key, value, expire=AI_CACHE_TTL)
+        except Exception as e:
+            print(f"[AI cache] disk write error: {e}")
+
+
 # ============================================================
 # 🔹 Xano helpers (duplicated from Streamlit app for now)
 # ============================================================
 
-def check_company_by_url(website_url: str) -> Optional[dict]:
+# One pooled HTTP/2 client for every Xano call: all helpers hit the same host,
+# so keep-alive saves a TCP+TLS handshake per call. Async so the endpoints can
+# await (and overlap) the reads instead of blocking the event loop.
+XANO_CLIENT = httpx.AsyncClient(
+    base_url=XANO_BASE_URL,
+    http2=True,
+    timeout=15,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+)
+
+
+@app.on_event("shutdown")
+async def _close_xano_client() -> None:
+    await XANO_CLIENT.aclose()
+
+
+# Short-lived caches so re-analysing the same company skips the Xano round-trips.
+# Cached values are shared between requests: callers must treat them as read-only.
+_XANO_COMPANY_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=300)
+_XANO_EVENTS_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=120)
+_XANO_KEY_LOCKS: Dict[Any, asyncio.Lock] = {}
+
+
+def _normalize_company_url_key(website_url: str) -> str:
+    """Cache key for a company URL: lowercase, no scheme, no www., no trailing slash."""
+    key = (website_url or "").strip().lower()
+    key = key.split("://", 1)[-1]
+    if key.startswith("www."):
+        key = key[4:]
+    return key.rstrip("/")
+
+
+async def _xano_cached(cache: TTLCache, key: Any, fetch):
+    """Return cache[key], awaiting fetch() once per key on a miss (empty results are not cached)."""
+    value = cache.get(key)
+    if value is not None:
+        logger.debug("[Xano] X-Cache: HIT %s", key)
+        return value
+    key_lock = _XANO_KEY_LOCKS.setdefault(key, asyncio.Lock())
+    # Concurrent misses for the same key wait here instead of all hitting Xano
+    async with key_lock:
+        value = cache.get(key)
+        if value is not None:
+            logger.debug("[Xano] X-Cache: HIT %s (after wait)", key)
+            return value
+        logger.debug("[Xano] X-Cache: MISS %s", key)
+        try:
+            value = await fetch()
+            if value:
+                cache[key] = value
+        finally:
+            _XANO_KEY_LOCKS.pop(key, None)
+    return value
+
+
+async def _xano_refreshed(cache: TTLCache, key: Any, fetch):
+    """Bypass cache[key]: await fetch() and store the fresh value (or drop the stale one)."""
+    value = await fetch()
+    if value:
+        cache[key] = value
+    else:
+        cache.pop(key, None)
+    return value
+
+
+def _invalidate_xano_company(company_id: Any = None, website_url: str = "") -> None:
+    """Drop cached Xano entries for a company after a write through this server."""
+    if website_url:
+        _XANO_COMPANY_CACHE.pop(("url", _normalize_company_url_key(website_url)), None)
+    if company_id is not None:
+        _XANO_COMPANY_CACHE.pop(("id", str(company_id)), None)
+        _XANO_EVENTS_CACHE.pop(str(company_id), None)
+
+
+async def check_company_by_url(website_url: str) -> Optional[dict]:
     """Check if a company already exists in the Xano database by URL."""
+    return await _xano_cached(
+        _XANO_COMPANY_CACHE,
+        ("url", _normalize_company_url_key(website_url)),
+        lambda: _check_company_by_url_uncached(website_url),
+    )
+
+
+async def _check_company_by_url_uncached(website_url: str) -> Optional[dict]:
     try:
-        endpoint = f"{XANO_BASE_URL}/api:8Bv5PK4I/get_company_by_url"
-        resp = requests.get(endpoint, params={"website_url": website_url}, timeout=10)
+        resp = await XANO_CLIENT.get("/api:8Bv5PK4I/get_company_by_url", params={"website_url": website_url}, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         
         # Handle list response (API returns [{"id":..., "name":..., "url":...}])
         if isinstance(data, list):
@@ -305,33 +458,47 @@ def check_company_by_url(website_url: str) -> Optional[dict]:
             return None
         return data
     except Exception as e:
-        print(f"[Xano] check_company_by_url error: {e}")
+        logger.warning("[Xano] check_company_by_url error: %s", e)
         return None
 
 
-def get_company_by_id(company_id: int) -> Optional[dict]:
+async def get_company_by_id(company_id: int) -> Optional[dict]:
     """Fetch full company data from Xano by company ID (new_company_id)."""
+    return await _xano_cached(
+        _XANO_COMPANY_CACHE,
+        ("id", str(company_id)),
+        lambda: _get_company_by_id_uncached(company_id),
+    )
+
+
+async def _get_company_by_id_uncached(company_id: int) -> Optional[dict]:
     try:
         # Use the correct API endpoint for fetching company by new_company_id
-        endpoint = f"{XANO_BASE_URL}/api:8Bv5PK4I/Get_new_company/{company_id}"
-        resp = requests.get(endpoint, timeout=15)
+        resp = await XANO_CLIENT.get(f"/api:8Bv5PK4I/Get_new_company/{company_id}", timeout=15)
         resp.raise_for_status()
-        return resp.json()
+        return orjson.loads(resp.content)
     except Exception as e:
-        print(f"[Xano] get_company_by_id error: {e}")
+        logger.warning("[Xano] get_company_by_id error: %s", e)
         return None
 
 
-def get_corporate_events_by_company_id(company_id: int) -> List[dict]:
+async def get_corporate_events_by_company_id(company_id: int) -> List[dict]:
     """Fetch corporate events for a company from Xano."""
+    return await _xano_cached(
+        _XANO_EVENTS_CACHE,
+        str(company_id),
+        lambda: _get_corporate_events_by_company_id_uncached(company_id),
+    )
+
+
+async def _get_corporate_events_by_company_id_uncached(company_id: int) -> List[dict]:
     try:
-        endpoint = f"{XANO_BASE_URL}/api:y4OAXSVm/Get_investors_corporate_events"
-        resp = requests.get(endpoint, params={"new_company_id": company_id}, timeout=20)
+        resp = await XANO_CLIENT.get("/api:y4OAXSVm/Get_investors_corporate_events", params={"new_company_id": company_id}, timeout=20)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         return data.get("New_Events_Wits_Advisors", []) or []
     except Exception as e:
-        print(f"[Xano] get_corporate_events_by_company_id error: {e}")
+        logger.warning("[Xano] get_corporate_events_by_company_id error: %s", e)
         return []
 
 
@@ -369,6 +536,63 @@ def _extract_company_linkedin_from_xano_payload(db_company: Optional[dict]) -> s
     return _normalize_company_linkedin_url(linkedin_block.get("LinkedIn_URL", ""))
 
 
+def first_truthy(d: dict, *keys: str, default: Any = None) -> Any:
+    """Value of the first key in d with a truthy value (Xano field-name fallbacks), else default."""
+    return next((v for k in keys if (v := d.get(k))), default)
+
+
+def _role_position(job_titles_id: Any) -> str:
+    """Comma-joined job titles for one role."""
+    if not isinstance(job_titles_id, list):
+        return ""
+    return ", ".join(jt["job_title"] for jt in job_titles_id if jt.__class__ is dict and jt.get("job_title"))
+
+
+def _role_to_dict(role: dict, default_status: str) -> dict:
+    """One Xano management role as a db_management row (Status defaults to default_status)."""
+    get = role.get
+    job_titles_id = get("job_titles_id", [])
+    return {
+        "Individual_text": get("Individual_text", ""),
+        "name": get("Individual_text", get("advisor_individuals", "")),
+        "position": _role_position(job_titles_id),
+        "job_titles_id": job_titles_id,
+        "Status": get("Status", default_status),
+        "linkedin_url": "",  # Not available in this endpoint
+        "current_employee_url": get("current_employer_url", ""),  # Note: Xano uses "current_employer_url"
+        "individuals_id": get("individuals_id", 0),
+        "role_id": get("id", 0),
+    }
+
+
+@lru_cache(maxsize=1024)
+def _parse_sectors_payload(sectors_payload: str) -> Optional[dict]:
+    """
+    Decode a new_sectors_data sectors_payload string, memoized on the raw string.
+    The payload is JSON nested inside the (already decoded) Xano response, so warm
+    requests for the same company skip the second parse. Callers must not mutate the result.
+    Empty/non-object payloads return None without raising; malformed JSON is reported once.
+    """
+    if sectors_payload.lstrip()[:1] not in ("[", "{"):
+        return None
+    try:
+        parsed = orjson.loads(sectors_payload)
+    except orjson.JSONDecodeError as e:
+        logger.warning("[Xano] new_sectors_data parse error: %s", e, exc_info=True)
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def _parse_maybe_json(value: Any) -> Any:
+    """Xano returns some overview blocks as JSON strings: decode those, pass anything else through."""
+    if isinstance(value, str):
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            return value
+    return value
+
+
 def _is_press_section_url(url: str) -> bool:
     """
     Returns True only if the URL looks like a news/press *section* page
@@ -475,7 +699,7 @@ def search_press_page(url_or_domain: str, company_name: str = "") -> str:
 # ============================================================
 def _url_domain(url: str) -> str:
     try:
-        return (urllib.parse.urlparse(url).netloc or "").lower().replace("www.", "")
+        return (urllib.parse.urlsplit(url).netloc or "").lower().replace("www.", "")
     except Exception:
         return ""
 
@@ -661,6 +885,594 @@ def strip_marketing_phrases(text: str) -> str:
     return cleaned.strip()
 
 
+# ============================================================
+# 🔹 AI summary parsing (generate_summary markdown -> overview fields)
+# ============================================================
+# Primary Business Focus mapping (name -> id)
+# This maps AI-detected business focus to the predefined list with IDs (read-only, built once at import)
+BUSINESS_FOCUS_MAP = MappingProxyType({
+    "Financial Services": {"id": 74, "name": "Financial Services"},
+    "Data & Analytics": {"id": 75, "name": "Data & Analytics"},
+    "Software": {"id": 76, "name": "Software"},
+    "Business Services": {"id": 77, "name": "Business Services"},
+    "Consumer Internet": {"id": 78, "name": "Consumer Internet"},
+    "Consumer Media": {"id": 79, "name": "Consumer Media"},
+    "Aerospace": {"id": 80, "name": "Aerospace"},
+    "Food": {"id": 81, "name": "Food"},
+    "Insurance": {"id": 82, "name": "Insurance"},
+    "Satellites": {"id": 83, "name": "Satellites"},
+    "Events": {"id": 84, "name": "Events"},
+    "Retail": {"id": 85, "name": "Retail"},
+    "Wholesale": {"id": 86, "name": "Wholesale"},
+    "Industrials": {"id": 87, "name": "Industrials"},
+    "Agriculture": {"id": 88, "name": "Agriculture"},
+    "Telecommunications": {"id": 89, "name": "Telecommunications"},
+    "Healthcare": {"id": 90, "name": "Healthcare"},
+    "Law": {"id": 91, "name": "Law"},
+    "Pharmaceuticals": {"id": 92, "name": "Pharmaceuticals"},
+    "Education & Training": {"id": 93, "name": "Education & Training"},
+    "Real Estate": {"id": 94, "name": "Real Estate"},
+    "Defence": {"id": 95, "name": "Defence"},
+    "Entertainment": {"id": 96, "name": "Entertainment"},
+    "Medical Equipment": {"id": 97, "name": "Medical Equipment"},
+    "Laboratory Equipment": {"id": 98, "name": "Laboratory Equipment"},
+    "Shipping": {"id": 99, "name": "Shipping"},
+    "Academic Publishing": {"id": 100, "name": "Academic Publishing"},
+    "Trade Association": {"id": 101, "name": "Trade Association"},
+    "Fitness": {"id": 102, "name": "Fitness"},
+    "Chemicals": {"id": 103, "name": "Chemicals"},
+    "Not-for-Profit": {"id": 104, "name": "Not-for-Profit"},
+    "Semiconductors": {"id": 105, "name": "Semiconductors"},
+    "Natural Resources": {"id": 106, "name": "Natural Resources"},
+    "Power Generation": {"id": 107, "name": "Power Generation"},
+    "Consumer Electronics": {"id": 108, "name": "Consumer Electronics"},
+    "Energy & Commodities": {"id": 109, "name": "Energy & Commodities"},
+    "Crypto": {"id": 110, "name": "Crypto"},
+    "Engineering": {"id": 111, "name": "Engineering"},
+    "Aviation": {"id": 112, "name": "Aviation"},
+    "Automotive": {"id": 113, "name": "Automotive"},
+    "Digital Infrastructure": {"id": 114, "name": "Digital Infrastructure"},
+    "Professional Body": {"id": 115, "name": "Professional Body"},
+    "Manufacturing": {"id": 117, "name": "Manufacturing"},
+    "Marketplace": {"id": 118, "name": "Marketplace"},
+    "Business Media": {"id": 119, "name": "Business Media"},
+    "Government Agency": {"id": 120, "name": "Government Agency"},
+    "Real Estate Broker": {"id": 121, "name": "Real Estate Broker"},
+})
+
+
+# Lowercased name -> BUSINESS_FOCUS_MAP entry, so exact matching is one dict lookup
+_BUSINESS_FOCUS_BY_LOWER = MappingProxyType({key.lower(): value for key, value in BUSINESS_FOCUS_MAP.items()})
+
+# Xano business focus id -> name, for payloads that only carry the id
+_BUSINESS_FOCUS_BY_ID = MappingProxyType({value["id"]: value["name"] for value in BUSINESS_FOCUS_MAP.values()})
+
+# Common variations -> BUSINESS_FOCUS_MAP name (substring match, first hit wins)
+BUSINESS_FOCUS_FUZZY_MATCHES = {
+    "fintech": "Financial Services",
+    "banking": "Financial Services",
+    "payments": "Financial Services",
+    "data analytics": "Data & Analytics",
+    "analytics": "Data & Analytics",
+    "big data": "Data & Analytics",
+    "saas": "Software",
+    "software as a service": "Software",
+    "enterprise software": "Software",
+    "b2b services": "Business Services",
+    "professional services": "Business Services",
+    "consulting": "Business Services",
+    "e-commerce": "Consumer Internet",
+    "online marketplace": "Marketplace",
+    "marketplace": "Marketplace",
+    "ecommerce": "Consumer Internet",
+    "pharma": "Pharmaceuticals",
+    "pharmaceutical": "Pharmaceuticals",
+    "drug development": "Pharmaceuticals",
+    "medical devices": "Medical Equipment",
+    "healthcare services": "Healthcare",
+    "health tech": "Healthcare",
+    "healthtech": "Healthcare",
+    "telecom": "Telecommunications",
+    "telecommunications": "Telecommunications",
+    "defense": "Defence",
+    "defence": "Defence",
+    "non-profit": "Not-for-Profit",
+    "nonprofit": "Not-for-Profit",
+    "nfp": "Not-for-Profit",
+    "energy": "Energy & Commodities",
+    "commodities": "Energy & Commodities",
+    "cryptocurrency": "Crypto",
+    "blockchain": "Crypto",
+    "real estate": "Real Estate",
+    "property": "Real Estate",
+}
+
+# Fuzzy matches resolved to (name, id) up front, as a tuple for the per-call scan
+_BUSINESS_FOCUS_FUZZY_ITEMS = tuple(
+    (fuzzy_key, (BUSINESS_FOCUS_MAP[name]["name"], BUSINESS_FOCUS_MAP[name]["id"]))
+    for fuzzy_key, name in BUSINESS_FOCUS_FUZZY_MATCHES.items()
+    if name in BUSINESS_FOCUS_MAP
+)
+
+
+def map_business_focus(ai_value: str) -> tuple[str, int]:
+    """
+    Map AI-detected business focus to predefined list.
+    Returns (name, id) tuple.
+    """
+    if not ai_value or not is_valid_value(ai_value):
+        return ("", 0)
+
+    ai_lower = ai_value.strip().lower()
+
+    # Try exact match first
+    value = _BUSINESS_FOCUS_BY_LOWER.get(ai_lower)
+    if value:
+        return (value["name"], value["id"])
+
+    # Try fuzzy matching for common variations
+    for fuzzy_key, mapped in _BUSINESS_FOCUS_FUZZY_ITEMS:
+        if fuzzy_key in ai_lower:
+            return mapped
+
+    # If no match found, return the AI value as-is with ID 0
+    logger.debug("[AI] Business focus %r not found in predefined list - using as-is", ai_value)
+    return (ai_value.strip(), 0)
+
+
+# Country normalization mapping (DB standard names)
+COUNTRY_NORMALIZATION = {
+    # UK variations
+    "england": "UK",
+    "scotland": "UK",
+    "wales": "UK",
+    "northern ireland": "UK",
+    "britain": "UK",
+    "great britain": "UK",
+    "united kingdom": "UK",
+    "u.k.": "UK",
+    "u.k": "UK",
+    # USA variations
+    "united states": "USA",
+    "united states of america": "USA",
+    "america": "USA",
+    "us": "USA",
+    "u.s.": "USA",
+    "u.s.a.": "USA",
+    "u.s.a": "USA",
+    # UAE variations
+    "united arab emirates": "UAE",
+    "u.a.e.": "UAE",
+    # Other common normalizations
+    "the netherlands": "Netherlands",
+    "holland": "Netherlands",
+    "republic of ireland": "Ireland",
+    "south korea": "Korea",
+    "republic of korea": "Korea",
+}
+
+
+@lru_cache(maxsize=1024)
+def normalize_country(country_val: str) -> str:
+    """Normalize country name to DB standard"""
+    if not country_val:
+        return ""
+    normalized = COUNTRY_NORMALIZATION.get(country_val.lower().strip(), country_val)
+    return normalized
+
+
+# Valid ownership status values - comprehensive classification
+VALID_OWNERSHIP_TYPES = frozenset({
+    # Public vs Private
+    "public", "private",
+    # By Investor/Owner Type
+    "venture-backed", "private equity-backed", "family-owned",
+    "employee-owned", "founder-owned", "institutional-owned",
+    # Special Categories
+    "government-owned", "non-profit", "subsidiary",
+    "cooperative", "partnership"
+})
+
+# (indicators, ownership type) checked in order: the first rule with any indicator
+# in the value wins, so PUBLIC is checked first and the bare "private" last.
+OWNERSHIP_RULES = (
+    (("public", "publicly traded", "publicly held", "listed", "nasdaq", "nyse", "lse", "stock exchange", "ipo"), "Public"),
+    (("private equity", "pe-backed", "pe backed"), "Private Equity-Backed"),
+    (("venture", "vc-backed", "vc backed"), "Venture-Backed"),
+    (("government", "state-owned", "state owned"), "Government-Owned"),
+    (("non-profit", "nonprofit", "not-for-profit"), "Non-Profit"),
+    (("family",), "Family-Owned"),
+    (("employee", "esop"), "Employee-Owned"),
+    (("founder",), "Founder-Owned"),
+    (("subsidiary", "owned by"), "Subsidiary"),
+    (("institutional",), "Institutional-Owned"),
+    (("partnership", "llp"), "Partnership"),
+    (("cooperative", "co-op"), "Cooperative"),
+    (("private",), "Private"),
+)
+
+
+def _build_ownership_automaton():
+    """One Aho-Corasick automaton over every OWNERSHIP_RULES indicator, valued (priority, type)."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for priority, (indicators, ownership) in enumerate(OWNERSHIP_RULES):
+        for ind in indicators:
+            if not automaton.exists(ind):
+                automaton.add_word(ind, (priority, ownership))
+    automaton.make_automaton()
+    return automaton
+
+
+_OWNERSHIP_AUTOMATON = _build_ownership_automaton()
+
+
+# Patterns used on every parsed summary line, compiled once
+_CITATION_RE = re.compile(r'\[\d+\]')
+_MD_URL_RE = re.compile(r'\[.*?\]\((https?://[^\)]+)\)')
+_PLAIN_URL_RE = re.compile(r'(https?://[^\s\)\[]+)')
+_YEAR_RE = re.compile(r'(\d{4})')
+_FY_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+_INTEGER_RE = re.compile(r'\d+')
+_HTTP_PREFIXES = ("http://", "https://")
+
+
+def strip_citations(val: str) -> str:
+    """Remove Perplexity/Sonar citation markers like [1], [2][3] from a value."""
+    if not isinstance(val, str):
+        return val
+    cleaned = _CITATION_RE.sub('', val)
+    return cleaned.strip()
+
+
+# Placeholder answers the model gives when it has nothing for a field
+_INVALID_VALUES = frozenset({"not found", "unknown", "n/a", "none", "<value>", "", "-"})
+
+
+@lru_cache(maxsize=2048)
+def is_valid_value(val: str) -> bool:
+    """Check if value is valid (not empty or placeholder)."""
+    if not val:
+        return False
+    low = strip_citations(val).lower().strip()
+    return low not in _INVALID_VALUES and not low.startswith("<")
+
+
+def extract_url(text: str) -> str:
+    """Extract URL from text, stripping citations and handling markdown links."""
+    text = strip_citations(text)
+    # Handle markdown links like [text](url)
+    md_match = _MD_URL_RE.search(text)
+    if md_match:
+        return md_match.group(1)
+    # Handle plain URLs (stop before any citation bracket)
+    url_match = _PLAIN_URL_RE.search(text)
+    if url_match:
+        return url_match.group(1).rstrip('.,;')
+    return text.strip()
+
+
+def extract_year(text: str) -> str:
+    if not text:
+        return ""
+    match = _FY_YEAR_RE.search(text)
+    return match.group(0) if match else text.strip()
+
+
+def parse_integer_list(text: str) -> List[int]:
+    if not text:
+        return []
+    return [int(x) for x in _INTEGER_RE.findall(text)]
+
+
+def _classify_ownership(val: str) -> str:
+    """Map a free-text ownership value to one of the canonical ownership types ("" if unknown)."""
+    val_lower = val.lower().strip()
+
+    if _OWNERSHIP_AUTOMATON is not None:
+        # Single pass over the value; the lowest-priority (earliest) rule that matched wins
+        hit = min((value for _, value in _OWNERSHIP_AUTOMATON.iter(val_lower)), default=None)
+        if hit:
+            return hit[1]
+    else:
+        for indicators, ownership in OWNERSHIP_RULES:
+            if any(ind in val_lower for ind in indicators):
+                return ownership
+    # Exact match fallback
+    if val_lower in VALID_OWNERSHIP_TYPES:
+        return val.strip()
+    # Log for debugging
+    logger.debug("[AI] Unknown ownership value: %r - defaulting to empty", val)
+    return ""
+
+
+# Optional list marker in front of a summary label ("- ", "* ", "1. ", "2) ")
+_SUMMARY_BULLET_RE = re.compile(r"(?:[-*•–—]|\d+[.)])[ \t]*")
+
+
+def _summary_setter(key: str, group: Optional[str] = None, transform=None):
+    """Handler that stores a valid value under fields[key] (or fields[group][key])."""
+    def handler(fields: Dict[str, Any], val: str) -> None:
+        if is_valid_value(val):
+            target = fields[group] if group else fields
+            target[key] = transform(val) if transform else val
+    return handler
+
+
+def _summary_website(fields: Dict[str, Any], val: str) -> None:
+    url = extract_url(val)
+    if is_valid_value(url) and url.startswith(_HTTP_PREFIXES):
+        fields["website"] = url
+
+
+def _summary_linkedin(fields: Dict[str, Any], val: str) -> None:
+    url = extract_url(val)
+    if is_valid_value(url) and "linkedin.com" in url.lower():
+        fields["linkedin"] = url
+
+
+def _summary_press_page(fields: Dict[str, Any], val: str) -> None:
+    url = extract_url(val)
+    if is_valid_value(url) and url.startswith(_HTTP_PREFIXES):
+        if _is_press_section_url(url):
+            fields["press_page"] = url
+        else:
+            logger.debug("[PressPage] Rejected AI-suggested URL (looks like article, not section): %s", url)
+
+
+def _summary_headquarters(fields: Dict[str, Any], hq: str) -> None:
+    if is_valid_value(hq):
+        # Very rough split city / country by last comma
+        if "," in hq:
+            parts = [p.strip() for p in hq.split(",")]
+            if len(parts) >= 2:
+                fields["city"] = ", ".join(parts[:-1])
+                fields["country"] = normalize_country(parts[-1])
+            else:
+                fields["city"] = hq
+        else:
+            fields["city"] = hq
+
+
+def _summary_ownership(fields: Dict[str, Any], val: str) -> None:
+    if is_valid_value(val):
+        ownership = _classify_ownership(val)
+        if ownership:
+            fields["ownership"] = ownership
+
+
+def _summary_business_focus(fields: Dict[str, Any], val: str) -> None:
+    if is_valid_value(val):
+        mapped_name, mapped_id = map_business_focus(val)
+        fields["primary_business_focus"] = mapped_name
+        fields["primary_business_focus_id"] = mapped_id
+        if mapped_id > 0:
+            logger.debug("[AI] Mapped business focus %r -> %r (ID: %s)", val, mapped_name, mapped_id)
+        else:
+            logger.debug("[AI] Business focus %r not mapped - using as-is", val)
+
+
+def _summary_primary_sectors(fields: Dict[str, Any], val: str) -> None:
+    if is_valid_value(val):
+        # Expect comma-separated list of sector names
+        parts = [p.strip() for p in val.split(",") if p.strip()]
+        for s in parts:
+            fields["ai_sectors"].append({"sector": s, "importance": "Primary"})
+
+
+def _summary_secondary_sectors(fields: Dict[str, Any], val: str) -> None:
+    if is_valid_value(val) and val.lower().strip() not in ["none", "n/a", "unknown"]:
+        parts = [p.strip() for p in val.split(",") if p.strip()]
+        for s in parts:
+            fields["ai_sectors"].append({"sector": s, "importance": "Secondary"})
+
+
+def _summary_year_founded(fields: Dict[str, Any], val: str) -> None:
+    if is_valid_value(val):
+        year_match = _YEAR_RE.search(val)
+        if year_match:
+            fields["year_founded"] = year_match.group(1)
+
+
+def _summary_investor_ids(fields: Dict[str, Any], val: str) -> None:
+    fields["investors_new_company"] = parse_integer_list(val)
+
+
+# Normalized label (lowercase, single spaces) -> handler(fields, value)
+SUMMARY_FIELD_HANDLERS = {
+    "website": _summary_website,
+    "former name": _summary_setter("former_name"),
+    "former names": _summary_setter("former_name"),
+    "linkedin": _summary_linkedin,
+    "press page": _summary_press_page,
+    "press-page": _summary_press_page,
+    "presspage": _summary_press_page,
+    "headquarters": _summary_headquarters,
+    "ownership": _summary_ownership,
+    "ownership status": _summary_ownership,
+    "primary business focus": _summary_business_focus,
+    "primary sectors": _summary_primary_sectors,
+    "secondary sectors": _summary_secondary_sectors,
+    "year founded": _summary_year_founded,
+    "founded": _summary_year_founded,
+    "ceo": _summary_setter("ceo"),
+    "investors": _summary_setter("investors"),
+    "company name": _summary_setter("company_name"),
+    "investors new company": _summary_investor_ids,
+    "investor ids": _summary_investor_ids,
+    "last investment amount": _summary_setter("last_investment_amount", "investment"),
+    "last investment currency": _summary_setter("last_investment_currency", "investment", str.upper),
+    "last investment date": _summary_setter("last_investment_date", "investment"),
+    "last investment source": _summary_setter("last_investment_source", "investment", extract_url),
+}
+for _label in ("revenues", "revenue"):
+    SUMMARY_FIELD_HANDLERS.update({
+        f"{_label}": _summary_setter("revenues_m", "revenues"),
+        f"{_label} currency": _summary_setter("revenues_currency", "revenues", str.upper),
+        f"{_label} year": _summary_setter("years_id", "revenues", extract_year),
+        f"{_label} source": _summary_setter("rev_source", "revenues", extract_url),
+    })
+for _label in ("enterprise value", "ev"):
+    SUMMARY_FIELD_HANDLERS.update({
+        f"{_label} currency": _summary_setter("ev_currency", "ev_data", str.upper),
+        f"{_label} year": _summary_setter("ev_year", "ev_data", extract_year),
+        f"{_label} source": _summary_setter("ev_source", "ev_data", extract_url),
+    })
+SUMMARY_FIELD_HANDLERS.update({
+    "enterprise value": _summary_setter("ev_value", "ev_data"),
+    "ev value": _summary_setter("ev_value", "ev_data"),
+    "ebitda": _summary_setter("EBITDA_m", "EBITDA"),
+    "ebitda currency": _summary_setter("EBITDA_currency", "EBITDA", str.upper),
+    "ebitda year": _summary_setter("EBITDA_year", "EBITDA", extract_year),
+    "ebitda source": _summary_setter("EBITDA_source", "EBITDA", extract_url),
+})
+
+
+def _summary_label(head: str) -> Optional[str]:
+    """
+    SUMMARY_FIELD_HANDLERS label for the text before a line's first ":" (bullets and
+    **bold** tolerated, e.g. "- **Year Founded**" -> "year founded"), else None.
+    """
+    head = head.strip(" \t")
+    if head.endswith("**"):
+        head = head[:-2]
+    bullet = _SUMMARY_BULLET_RE.match(head)
+    # "**Label" also starts with a bullet character, so fall back to the unstripped head
+    candidates = (head[bullet.end():], head) if bullet else (head,)
+    for candidate in candidates:
+        if candidate.startswith("**"):
+            candidate = candidate[2:]
+        label = " ".join(candidate.lower().split())
+        if label in SUMMARY_FIELD_HANDLERS:
+            return label
+    return None
+
+
+def parse_summary_md(summary_md: str) -> Dict[str, Any]:
+    """
+    Parse the "- Label: value" lines of a generate_summary() markdown block.
+    Missing fields keep their empty defaults; a later line overrides an earlier one.
+    """
+    fields: Dict[str, Any] = {
+        "website": "",
+        "company_name": "",
+        "linkedin": "",
+        "press_page": "",
+        "city": "",
+        "country": "",
+        "year_founded": "",
+        "ceo": "",
+        "ownership": "",
+        "former_name": "",
+        "investors": "",
+        "investors_new_company": [],
+        "investment": {
+            "last_investment_amount": "",
+            "last_investment_currency": "",
+            "last_investment_date": "",
+            "last_investment_source": "",
+        },
+        "revenues": {
+            "revenues_m": "",
+            "rev_source": "",
+            "revenues_currency": "",
+            "years_id": "",
+        },
+        "ev_data": {
+            "ev_value": "",
+            "ev_currency": "",
+            "ev_year": "",
+            "ev_source": "",
+        },
+        "EBITDA": {
+            "EBITDA_m": "",
+            "EBITDA_source": "",
+            "EBITDA_currency": "",
+            "EBITDA_year": "",
+        },
+        "ai_sectors": [],
+        "primary_business_focus": "",
+        "primary_business_focus_id": 0,
+    }
+    # Strip Perplexity citation markers [1][2][3] so they never
+    # end up in parsed values or field-matching strings.
+    # One pass: split each line at its first ":" and dispatch on the label.
+    for line in strip_citations(summary_md or "").split("\n"):
+        head, sep, val = line.partition(":")
+        if not sep:
+            continue
+        label = _summary_label(head)
+        if label is None:
+            continue
+        if val.startswith("**"):
+            val = val[2:]
+        SUMMARY_FIELD_HANDLERS[label](fields, val.strip())
+    return fields
+
+
+# ============================================================
+# 🔹 AI vs DB event matching (gap analysis)
+# ============================================================
+EVENT_STOP_WORDS = frozenset({
+    "the",
+    "a",
+    "an",
+    "and",
+    "or",
+    "to",
+    "of",
+    "in",
+    "for",
+    "with",
+    "by",
+    "from",
+    "its",
+    "as",
+})
+
+
+@lru_cache(maxsize=2048)
+def extract_keywords(text: str) -> frozenset:
+    # Memoized: the same DB event descriptions come back on every /analyze of a company
+    if not text:
+        return frozenset()
+    # One pass straight into the set; no intermediate word set to subtract from
+    return frozenset(word for word in text.lower().split() if word not in EVENT_STOP_WORDS)
+
+
+def split_matched_events(
+    ai_events: List[dict], db_events: List[dict], threshold: float = 0.4
+) -> tuple[List[dict], List[dict]]:
+    """
+    Split ai_events into (matched, missing) against db_events.
+
+    An AI event matches when some DB event shares enough keywords with it:
+    overlap / max(len(ai_keywords), len(db_keywords)) >= threshold. DB keywords are
+    extracted once and indexed by keyword, so each AI event only visits DB events it
+    overlaps with instead of comparing every (AI, DB) pair.
+    """
+    db_keywords = [extract_keywords(db_ev.get("description", "")) for db_ev in db_events]
+    postings: Dict[str, List[int]] = defaultdict(list)
+    for i, keywords in enumerate(db_keywords):
+        for kw in keywords:
+            postings[kw].append(i)
+
+    matched: List[dict] = []
+    missing: List[dict] = []
+    for ev in ai_events:
+        ai_keywords = extract_keywords(ev.get("Event (short)", ev.get("event_short", "")))
+        overlaps: Counter = Counter()
+        for kw in ai_keywords:
+            overlaps.update(postings.get(kw, ()))
+        n_ai = len(ai_keywords)
+        if any(overlap / max(n_ai, len(db_keywords[i])) >= threshold for i, overlap in overlaps.items()):
+            matched.append(ev)
+        else:
+            missing.append(ev)
+    return matched, missing
+
+
 # ============================================================
 # 🔹 Utilities for lightweight page parsing (IMPROVED)
 # ============================================================
@@ -1099,13 +1911,7 @@ def enrich_ai_events_with_llm(events: List[dict], max_enrich: int = 5) -> List[d
     count = 0
     for ev in events:
         merged = dict(ev)
-        src = (
-            ev.get("Source URL")
-            or ev.get("source_url")
-            or ev.get("press_release_url")
-            or ev.get("announcement_url")
-            or ""
-        ).strip()
+        src = first_truthy(ev, "Source URL", "source_url", "press_release_url", "announcement_url", default="").strip()
 
         if src and count < max_enrich:
             count += 1
@@ -1156,14 +1962,9 @@ def ai_enrich_single_event(event: Dict[str, Any]) -> Dict[str, Any]:
     """
     Enrich a single event with evidence extraction.
     """
-    source_url = (
-        event.get("source_url")
-        or event.get("Source URL")
-        or event.get("press_release_url")
-        or ""
-    ).strip()
-    title = event.get("title") or event.get("Event (short)") or event.get("event_short") or ""
-    company = event.get("company") or event.get("target_company") or ""
+    source_url = first_truthy(event, "source_url", "Source URL", "press_release_url", default="").strip()
+    title = first_truthy(event, "title", "Event (short)", "event_short", default="")
+    company = first_truthy(event, "company", "target_company", default="")
     counterparties = event.get("counterparties") or []
     if isinstance(counterparties, list):
         cp_names = counterparties
@@ -1344,8 +2145,8 @@ def validate_enriched_dates(result: Dict[str, Any]) -> Dict[str, Any]:
     return result
 
 
-@app.post("/extract_event_meta", response_class=JSONResponse)
-async def extract_event_meta(payload: Dict[str, Any]) -> JSONResponse:
+@app.post("/extract_event_meta", response_class=ORJSONResponse)
+async def extract_event_meta(payload: Dict[str, Any]) -> ORJSONResponse:
     """
     Fetch a page and try to extract a reasonable title, first date found, and long text.
     Body: { "url": "https://example.com/press-release" }
@@ -1353,14 +2154,14 @@ async def extract_event_meta(payload: Dict[str, Any]) -> JSONResponse:
     url = (payload or {}).get("url", "").strip()
     if not url:
         print(f"[extract_event_meta] Missing URL in payload")
-        return JSONResponse({"error": "Missing url"}, status_code=400)
+        return ORJSONResponse({"error": "Missing url"}, status_code=400)
 
     print(f"[extract_event_meta] Processing: {url}")
     try:
         html = fetch_html(url)
         if not html:
             print(f"[extract_event_meta] Fetch returned no HTML for: {url}")
-            return JSONResponse({"error": f"Could not fetch page: {url[:50]}..."}, status_code=400)
+            return ORJSONResponse({"error": f"Could not fetch page: {url[:50]}..."}, status_code=400)
         soup = BeautifulSoup(html, "html.parser")
 
         # Title preference: h1 > title tag
@@ -1404,7 +2205,7 @@ async def extract_event_meta(payload: Dict[str, Any]) -> JSONResponse:
         if collected:
             long_desc = "\n\n".join(collected)
 
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "title": title,
                 "announcement_date": date_iso,
@@ -1413,51 +2214,51 @@ async def extract_event_meta(payload: Dict[str, Any]) -> JSONResponse:
             }
         )
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return ORJSONResponse({"error": str(e)}, status_code=500)
 
 
-@app.post("/ai_extract_event_from_url", response_class=JSONResponse)
-async def ai_extract_event_from_url(payload: Dict[str, Any]) -> JSONResponse:
+@app.post("/ai_extract_event_from_url", response_class=ORJSONResponse)
+async def ai_extract_event_from_url(payload: Dict[str, Any]) -> ORJSONResponse:
     """
     Fetch page (direct GET) and ask LLM to extract corporate event fields.
     Body: { "url": "..." }
     """
     url = (payload or {}).get("url", "").strip()
     if not url:
-        return JSONResponse({"error": "Missing url"}, status_code=400)
+        return ORJSONResponse({"error": "Missing url"}, status_code=400)
 
     try:
         html = fetch_html(url)
         if not html:
-            return JSONResponse({"error": "Fetch failed"}, status_code=400)
+            return ORJSONResponse({"error": "Fetch failed"}, status_code=400)
         soup = BeautifulSoup(html, "html.parser")
         text = soup.get_text(" ", strip=True)
         ai_data = ai_extract_event_from_text(text, url)
-        return JSONResponse(ai_data)
+        return ORJSONResponse(ai_data)
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return ORJSONResponse({"error": str(e)}, status_code=500)
 
 
-@app.post("/enrich_event", response_class=JSONResponse)
-async def enrich_event(payload: Dict[str, Any]) -> JSONResponse:
+@app.post("/enrich_event", response_class=ORJSONResponse)
+async def enrich_event(payload: Dict[str, Any]) -> ORJSONResponse:
     """
     Enrich a single corporate event with evidence extraction (Scrapfly if available + LLM).
     Body: { "event": { ... } }
     """
     ev = (payload or {}).get("event") or {}
     if not ev:
-        return JSONResponse({"error": "Missing event"}, status_code=400)
+        return ORJSONResponse({"error": "Missing event"}, status_code=400)
     try:
         enriched = ai_enrich_single_event(ev)
         if "error" in enriched:
-            return JSONResponse(enriched, status_code=400)
-        return JSONResponse({"enriched_event": enriched})
+            return ORJSONResponse(enriched, status_code=400)
+        return ORJSONResponse({"enriched_event": enriched})
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return ORJSONResponse({"error": str(e)}, status_code=500)
 
 
-@app.post("/smart_enrich_event", response_class=JSONResponse)
-async def smart_enrich_event(payload: Dict[str, Any]) -> JSONResponse:
+@app.post("/smart_enrich_event", response_class=ORJSONResponse)
+async def smart_enrich_event(payload: Dict[str, Any]) -> ORJSONResponse:
     """
     Smart enrichment: First parse source URL, then search web if data is incomplete.
     Body: { "url": "...", "event": { title, company, counterparties, ... } }
@@ -1471,7 +2272,7 @@ async def smart_enrich_event(payload: Dict[str, Any]) -> JSONResponse:
     ev = (payload or {}).get("event") or {}
     
     if not url:
-        return JSONResponse({"error": "Missing url"}, status_code=400)
+        return ORJSONResponse({"error": "Missing url"}, status_code=400)
     
     print(f"\n🧠 Smart Enrich: {url}")
     result = {}
@@ -1586,45 +2387,44 @@ async def smart_enrich_event(payload: Dict[str, Any]) -> JSONResponse:
         # =====================================================
         result = validate_enriched_dates(result)
         
-        return JSONResponse({"enriched_event": result, "source": "smart_enrich"})
+        return ORJSONResponse({"enriched_event": result, "source": "smart_enrich"})
         
     except Exception as e:
         print(f"   ❌ Smart enrich error: {e}")
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return ORJSONResponse({"error": str(e)}, status_code=500)
 
 
 # ============================================================
 # 🔹 Routes
 # ============================================================
 
-@app.get("/investors_search", response_class=JSONResponse)
+@app.get("/investors_search", response_class=ORJSONResponse)
 async def investors_search(q: str = "", page: int = 1, per_page: int = 25):
     """
     Proxy for the Xano investors list endpoint.
     Handles Xano auth transparently — credentials stay on the server.
     """
-    xano_url = f"{XANO_BASE_URL}/api:y4OAXSVm/investors_with_d_a_list"
     params = {"page": page, "per_page": per_page, "Search_Query": q.lower()}
 
-    def _call(token: str):
+    async def _call(token: str):
         headers = {"Authorization": f"Bearer {token}"} if token else {}
-        return requests.get(xano_url, params=params, headers=headers, timeout=10)
+        return await XANO_CLIENT.get("/api:y4OAXSVm/investors_with_d_a_list", params=params, headers=headers, timeout=10)
 
     token = _get_xano_token()
     try:
-        resp = _call(token)
+        resp = await _call(token)
         if resp.status_code == 401:
             # Token may have expired — refresh once and retry
             token = _get_xano_token(force_refresh=True)
-            resp = _call(token)
+            resp = await _call(token)
         resp.raise_for_status()
-        return JSONResponse(resp.json())
+        return ORJSONResponse(resp.json())
     except Exception as e:
         print(f"[investors_search] error: {e}")
-        return JSONResponse({"items": [], "error": str(e)}, status_code=502)
+        return ORJSONResponse({"items": [], "error": str(e)}, status_code=502)
 
 
-@app.post("/investors_create", response_class=JSONResponse)
+@app.post("/investors_create", response_class=ORJSONResponse)
 async def investors_create(request: Request):
     """
     Proxy for creating a new investor record in Xano.
@@ -1633,12 +2433,12 @@ async def investors_create(request: Request):
     try:
         body = await request.json()
     except Exception:
-        return JSONResponse({"error": "Invalid JSON body"}, status_code=400)
+        return ORJSONResponse({"error": "Invalid JSON body"}, status_code=400)
 
     name    = (body.get("company_name") or "").strip()
     website = (body.get("website_url") or "").strip()
     if not name or not website:
-        return JSONResponse({"error": "company_name and website_url are required"}, status_code=422)
+        return ORJSONResponse({"error": "company_name and website_url are required"}, status_code=422)
 
     pbf_raw = body.get("primary_business_focus_id", 74)
     try:
@@ -1648,7 +2448,6 @@ async def investors_create(request: Request):
     if primary_business_focus_id <= 0:
         primary_business_focus_id = 74
 
-    xano_url = f"{XANO_BASE_URL}/api:y4OAXSVm/investors_new_company"
     payload = {
         "company_name": name,
         "website_url":  website,
@@ -1659,21 +2458,25 @@ async def investors_create(request: Request):
         "primary_business_focus_id": primary_business_focus_id,
     }
 
-    def _call(token: str):
+    async def _call(token: str):
         headers = {"Authorization": f"Bearer {token}"} if token else {}
-        return requests.post(xano_url, json=payload, headers=headers, timeout=10)
+        return await XANO_CLIENT.post("/api:y4OAXSVm/investors_new_company", json=payload, headers=headers, timeout=10)
 
     try:
         token = _get_xano_token()
-        resp = _call(token)
+        resp = await _call(token)
         if resp.status_code == 401:
             token = _get_xano_token(force_refresh=True)
-            resp = _call(token)
+            resp = await _call(token)
         resp.raise_for_status()
-        return JSONResponse(resp.json())
+        created = resp.json()
+        _invalidate_xano_company(
+            created.get("id") if isinstance(created, dict) else None, website_url=website
+        )
+        return ORJSONResponse(created)
     except Exception as e:
         print(f"[investors_create] error: {e}")
-        return JSONResponse({"error": str(e)}, status_code=502)
+        return ORJSONResponse({"error": str(e)}, status_code=502)
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -1695,8 +2498,8 @@ async def index(request: Request) -> HTMLResponse:
     )
 
 
-@app.post("/api/search_company_headquarters", response_class=JSONResponse)
-async def search_company_headquarters_api(payload: Dict[str, Any]) -> JSONResponse:
+@app.post("/api/search_company_headquarters", response_class=ORJSONResponse)
+async def search_company_headquarters_api(payload: Dict[str, Any]) -> ORJSONResponse:
     """
     Search for a company's headquarters location, or look up state if city/country provided.
     Body: { "company": "Acme Corp", "website": "https://acme.com", "city": "San Francisco", "country": "USA" }
@@ -1756,17 +2559,17 @@ async def search_company_headquarters_api(payload: Dict[str, Any]) -> JSONRespon
             if state:
                 result = {"city": existing_city, "state": state, "country": "USA"}
                 print(f"📍 State lookup for {existing_city}, {existing_country}: {state}")
-                return JSONResponse(result)
+                return ORJSONResponse(result)
             else:
                 print(f"⚠️ Unknown US city: {existing_city}, trying web search...")
         else:
             # Non-US country - just return what we have
             result = {"city": existing_city, "state": "", "country": existing_country}
             print(f"📍 Non-US location: {existing_city}, {existing_country}")
-            return JSONResponse(result)
+            return ORJSONResponse(result)
     
     if not company and not website:
-        return JSONResponse({"error": "Missing 'company' or 'website' field", "city": "", "state": "", "country": ""}, status_code=400)
+        return ORJSONResponse({"error": "Missing 'company' or 'website' field", "city": "", "state": "", "country": ""}, status_code=400)
     
     try:
         from searxng_analyzer import search_company_headquarters
@@ -1781,19 +2584,19 @@ async def search_company_headquarters_api(payload: Dict[str, Any]) -> JSONRespon
                 print(f"📍 Added state from lookup: {state}")
         
         print(f"📍 HQ search result for {company}: {result}")
-        return JSONResponse(result)
+        return ORJSONResponse(result)
             
     except ImportError as e:
         print(f"❌ search_company_headquarters not available: {e}")
-        return JSONResponse({"error": "Function not available", "city": "", "state": "", "country": ""}, status_code=500)
+        return ORJSONResponse({"error": "Function not available", "city": "", "state": "", "country": ""}, status_code=500)
     
     except Exception as e:
         print(f"❌ Error searching company HQ: {e}")
-        return JSONResponse({"error": str(e), "city": "", "state": "", "country": ""}, status_code=500)
+        return ORJSONResponse({"error": str(e), "city": "", "state": "", "country": ""}, status_code=500)
 
 
-@app.post("/api/search_company_linkedin", response_class=JSONResponse)
-async def search_company_linkedin_api(payload: Dict[str, Any]) -> JSONResponse:
+@app.post("/api/search_company_linkedin", response_class=ORJSONResponse)
+async def search_company_linkedin_api(payload: Dict[str, Any]) -> ORJSONResponse:
     """
     Recover the current LinkedIn company URL using stable company identifiers.
     Body: { "company": "Acme Corp", "website": "https://acme.com", "old_linkedin_url": "https://..." }
@@ -1805,7 +2608,7 @@ async def search_company_linkedin_api(payload: Dict[str, Any]) -> JSONResponse:
     normalized_old_linkedin = _normalize_company_linkedin_url(old_linkedin_url)
 
     if not company and not website:
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "error": "Missing 'company' or 'website' field",
                 "linkedin_url": None,
@@ -1821,12 +2624,12 @@ async def search_company_linkedin_api(payload: Dict[str, Any]) -> JSONResponse:
 
     try:
         if website:
-            existing_company = check_company_by_url(website)
+            existing_company = await check_company_by_url(website)
             if existing_company and existing_company.get("id"):
-                db_company = get_company_by_id(existing_company["id"])
+                db_company = await get_company_by_id(existing_company["id"])
                 xano_linkedin = _extract_company_linkedin_from_xano_payload(db_company)
                 if xano_linkedin:
-                    return JSONResponse(
+                    return ORJSONResponse(
                         {
                             "linkedin_url": xano_linkedin,
                             "source": "xano",
@@ -1849,7 +2652,7 @@ async def search_company_linkedin_api(payload: Dict[str, Any]) -> JSONResponse:
         queries_used = result.get("queries_used", []) or []
         matched_by = result.get("matched_by", "")
 
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "linkedin_url": linkedin_url or None,
                 "source": source,
@@ -1865,7 +2668,7 @@ async def search_company_linkedin_api(payload: Dict[str, Any]) -> JSONResponse:
 
     except ImportError as e:
         print(f"❌ search_company_linkedin_detailed not available: {e}")
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "error": "Function not available",
                 "linkedin_url": None,
@@ -1880,7 +2683,7 @@ async def search_company_linkedin_api(payload: Dict[str, Any]) -> JSONResponse:
         )
     except Exception as e:
         print(f"❌ Error searching company LinkedIn: {e}")
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "error": str(e),
                 "linkedin_url": None,
@@ -1895,8 +2698,8 @@ async def search_company_linkedin_api(payload: Dict[str, Any]) -> JSONResponse:
         )
 
 
-@app.post("/api/search_individual_linkedin", response_class=JSONResponse)
-async def search_individual_linkedin(payload: Dict[str, Any]) -> JSONResponse:
+@app.post("/api/search_individual_linkedin", response_class=ORJSONResponse)
+async def search_individual_linkedin(payload: Dict[str, Any]) -> ORJSONResponse:
     """
     Search for an individual's LinkedIn profile AND extract location from SEO snippets.
     Body: { "name": "John Smith", "company": "Acme Corp", "position": "CFO" }
@@ -1907,7 +2710,7 @@ async def search_individual_linkedin(payload: Dict[str, Any]) -> JSONResponse:
     position = (payload or {}).get("position", "").strip()
     
     if not name:
-        return JSONResponse({"error": "Missing 'name' field", "linkedin_url": None, "location": {}}, status_code=400)
+        return ORJSONResponse({"error": "Missing 'name' field", "linkedin_url": None, "location": {}}, status_code=400)
     
     try:
         search_query = " ".join([p for p in [name, position, company, "linkedin"] if p]).strip()
@@ -1925,10 +2728,10 @@ async def search_individual_linkedin(payload: Dict[str, Any]) -> JSONResponse:
             if location and (location.get("city") or location.get("state") or location.get("country")):
                 location = _normalize_location_with_ai(name, company, position, linkedin_url, location)
             print(f"✅ Found LinkedIn for {name}: {linkedin_url}, location: {location}")
-            return JSONResponse({"linkedin_url": linkedin_url, "location": location, "query": search_query})
+            return ORJSONResponse({"linkedin_url": linkedin_url, "location": location, "query": search_query})
         else:
             print(f"⚠️ No LinkedIn found for: {name}")
-            return JSONResponse({"linkedin_url": None, "location": {}, "query": search_query})
+            return ORJSONResponse({"linkedin_url": None, "location": {}, "query": search_query})
             
     except ImportError as ie:
         print(f"⚠️ search_person_linkedin_with_location not available: {ie}, trying fallback")
@@ -1939,22 +2742,22 @@ async def search_individual_linkedin(payload: Dict[str, Any]) -> JSONResponse:
             
             if linkedin_url:
                 print(f"✅ Found LinkedIn (fallback): {linkedin_url}")
-                return JSONResponse({"linkedin_url": linkedin_url, "location": {}, "query": search_query})
+                return ORJSONResponse({"linkedin_url": linkedin_url, "location": {}, "query": search_query})
             
             print(f"⚠️ No LinkedIn found (fallback) for: {name}")
-            return JSONResponse({"linkedin_url": None, "location": {}, "query": search_query})
+            return ORJSONResponse({"linkedin_url": None, "location": {}, "query": search_query})
             
         except Exception as e:
             print(f"❌ Fallback search failed: {e}")
-            return JSONResponse({"error": str(e), "linkedin_url": None, "location": {}}, status_code=500)
+            return ORJSONResponse({"error": str(e), "linkedin_url": None, "location": {}}, status_code=500)
     
     except Exception as e:
         print(f"❌ Error searching individual LinkedIn: {e}")
-        return JSONResponse({"error": str(e), "linkedin_url": None, "location": {}}, status_code=500)
+        return ORJSONResponse({"error": str(e), "linkedin_url": None, "location": {}}, status_code=500)
 
 
-@app.post("/api/search_individual_location", response_class=JSONResponse)
-async def search_individual_location(payload: Dict[str, Any]) -> JSONResponse:
+@app.post("/api/search_individual_location", response_class=ORJSONResponse)
+async def search_individual_location(payload: Dict[str, Any]) -> ORJSONResponse:
     """
     Search for an individual's likely location (city/state/country) using AI analysis of search results.
     Body: { "name": "Mary Meeker", "company": "Kleiner Perkins", "position": "Partner", "linkedin_url": "https://..." }
@@ -1966,7 +2769,7 @@ async def search_individual_location(payload: Dict[str, Any]) -> JSONResponse:
     linkedin_url = (payload or {}).get("linkedin_url", "").strip()
 
     if not name:
-        return JSONResponse({"error": "Missing 'name' field", "city": "", "state": "", "country": ""}, status_code=400)
+        return ORJSONResponse({"error": "Missing 'name' field", "city": "", "state": "", "country": ""}, status_code=400)
 
     try:
         # NEW: Use AI to analyze raw SerpAPI results instead of regex patterns
@@ -1991,51 +2794,31 @@ async def search_individual_location(payload: Dict[str, Any]) -> JSONResponse:
                 result = _normalize_location_with_ai(name, company, position, linkedin_url, result)
         
         print(f"📍 Individual location result for {name}: {result}")
-        return JSONResponse(result)
+        return ORJSONResponse(result)
     except Exception as e:
         print(f"❌ Error searching individual location: {e}")
         import traceback
         traceback.print_exc()
-        return JSONResponse({"error": str(e), "city": "", "state": "", "country": ""}, status_code=500)
-
-
-@app.post("/refresh_db", response_class=JSONResponse)
-async def refresh_db(payload: Dict[str, Any]) -> JSONResponse:
-    """
-    Body: { "query": "https://heliointelligence.com/" }
-
-    Returns ONLY database data (no AI re-analysis):
-    {
-      "existing_company": {...} or null,
-      "db_company": {...} or null,
-      "db_overview": {...},
-      "db_events": [...],
-      "db_management": [...],
-      "top_management": [],  // Empty since no AI analysis
-      "ai_events": [],       // Empty since no AI analysis
-      "missing_events": [],  // Empty since no AI analysis
-      "matched_events": []   // Empty since no AI analysis
-    }
-    """
-    query = (payload or {}).get("query", "").strip()
-    if not query:
-        return JSONResponse({"error": "Missing 'query' field"}, status_code=400)
-
-    # 1) Pre-check in Xano
-    existing_company = check_company_by_url(query)
-    db_company = None
-    db_events: List[dict] = []
-    db_management: List[dict] = []
-
-    if existing_company and existing_company.get("id"):
-        cid = existing_company["id"]
-        with ThreadPoolExecutor(max_workers=2) as _xano_ex:
-            _f_company = _xano_ex.submit(get_company_by_id, cid)
-            _f_events  = _xano_ex.submit(get_corporate_events_by_company_id, cid)
-            db_company = _f_company.result()
-            db_events  = _f_events.result()
-
-    # 2) DB overview (extract from db_company)
+        return ORJSONResponse({"error": str(e), "city": "", "state": "", "country": ""}, status_code=500)
+
+
+# /refresh_db answer when the URL has no company in Xano (copied per request)
+_EMPTY_REFRESH_RESPONSE = {
+    "existing_company": None,
+    "db_company": None,
+    "db_overview": None,
+    "ai_overview": None,
+    "db_events": [],
+    "ai_events": [],
+    "missing_events": [],
+    "matched_events": [],
+    "top_management": [],
+    "db_management": [],
+}
+
+
+def _build_db_overview(db_company: Optional[dict], query: str) -> Optional[dict]:
+    """Normalize a Xano company payload to the overview shape the UI compares with the AI side."""
     db_overview = None
     if db_company:
         try:
@@ -2051,26 +2834,13 @@ async def refresh_db(payload: Dict[str, Any]) -> JSONResponse:
             website = company_info.get("url", "")
             desc = company_info.get("description", "")
 
-            def parse_maybe_json(value):
-                if isinstance(value, str):
-                    try:
-                        return json.loads(value)
-                    except Exception:
-                        return value
-                return value
-
-            former_name = (
-                company_info.get("former_name")
-                or company_info.get("former_names")
-                or company_info.get("Former_Name")
-                or ""
-            )
-            investors = company_info.get("investors") or company_info.get("investor_names") or ""
+            former_name = first_truthy(company_info, "former_name", "former_names", "Former_Name", default="")
+            investors = first_truthy(company_info, "investors", "investor_names", default="")
             investors_new_company = company_info.get("investors_new_company") or []
-            investment = parse_maybe_json(company_info.get("investment")) or {}
-            revenues = parse_maybe_json(company_info.get("revenues")) or {}
-            ev_data = parse_maybe_json(company_info.get("ev_data")) or {}
-            EBITDA = parse_maybe_json(company_info.get("EBITDA") or company_info.get("ebitda")) or {}
+            investment = _parse_maybe_json(company_info.get("investment")) or {}
+            revenues = _parse_maybe_json(company_info.get("revenues")) or {}
+            ev_data = _parse_maybe_json(company_info.get("ev_data")) or {}
+            EBITDA = _parse_maybe_json(first_truthy(company_info, "EBITDA", "ebitda")) or {}
 
             # Year founded - check _years.Year first (proper structure), fallback to year_founded
             years_block = company_info.get("_years") or {}
@@ -2090,9 +2860,9 @@ async def refresh_db(payload: Dict[str, Any]) -> JSONResponse:
                     year_founded = ""
 
             # Primary business focus - can be nested object or direct reference
-            business_focus_block = company_info.get("primary_business_focus_id") or company_info.get("_primary_business_focus") or {}
+            business_focus_block = first_truthy(company_info, "primary_business_focus_id", "_primary_business_focus", default={})
             if isinstance(business_focus_block, dict):
-                primary_business_focus = business_focus_block.get("business_focus", "") or business_focus_block.get("primary_business_focus", "") or business_focus_block.get("name", "")
+                primary_business_focus = first_truthy(business_focus_block, "business_focus", "primary_business_focus", "name", default="")
                 primary_business_focus_id = business_focus_block.get("id", 0)
             else:
                 primary_business_focus = ""
@@ -2100,44 +2870,35 @@ async def refresh_db(payload: Dict[str, Any]) -> JSONResponse:
 
             # Sectors - try new_sectors_data first (has actual sector names), fallback to sectors_id
             sectors = []
-            primary_sectors = []
-            secondary_sectors = []
 
             # First check new_sectors_data (JSON string payload with real data)
             new_sectors_data = company_info.get("new_sectors_data") or []
-            if isinstance(new_sectors_data, list) and len(new_sectors_data) > 0:
-                try:
-                    sectors_payload = new_sectors_data[0].get("sectors_payload", "")
-                    if sectors_payload:
-                        import json
-                        parsed_sectors = json.loads(sectors_payload)
-                        # Extract primary sectors
-                        for s in parsed_sectors.get("primary_sectors", []):
-                            if isinstance(s, dict) and s.get("sector_name"):
-                                primary_sectors.append({
-                                    "sector": s.get("sector_name"),
-                                    "id": s.get("id", 0),
-                                    "importance": "Primary"
-                                })
-                        # Extract secondary sectors
-                        for s in parsed_sectors.get("secondary_sectors", []):
-                            if isinstance(s, dict) and s.get("sector_name"):
-                                secondary_sectors.append({
-                                    "sector": s.get("sector_name"),
-                                    "id": s.get("id", 0),
-                                    "importance": "Secondary"
-                                })
-                        sectors = primary_sectors + secondary_sectors
-                except Exception as e:
-                    print(f"[Xano] new_sectors_data parse error: {e}")
+            sectors_payload = new_sectors_data[0].get("sectors_payload") if (
+                isinstance(new_sectors_data, list) and new_sectors_data and isinstance(new_sectors_data[0], dict)
+            ) else None
+            parsed_sectors = _parse_sectors_payload(sectors_payload) if isinstance(sectors_payload, str) else None
+            if parsed_sectors:
+                # Extract primary sectors
+                primary_sectors = [
+                    {"sector": s["sector_name"], "id": s.get("id", 0), "importance": "Primary"}
+                    for s in parsed_sectors.get("primary_sectors") or ()
+                    if isinstance(s, dict) and s.get("sector_name")
+                ]
+                # Extract secondary sectors
+                secondary_sectors = [
+                    {"sector": s["sector_name"], "id": s.get("id", 0), "importance": "Secondary"}
+                    for s in parsed_sectors.get("secondary_sectors") or ()
+                    if isinstance(s, dict) and s.get("sector_name")
+                ]
+                sectors = primary_sectors + secondary_sectors
 
             # Fallback to sectors_id if new_sectors_data didn't yield results
             if not sectors:
-                sectors_data = company_info.get("sectors_id") or company_info.get("_sectors") or company_info.get("sectors") or []
+                sectors_data = first_truthy(company_info, "sectors_id", "_sectors", "sectors", default=[])
                 if isinstance(sectors_data, list):
                     for s in sectors_data:
                         if isinstance(s, dict):
-                            sector_name = s.get("sector_name") or s.get("sector") or s.get("name", "")
+                            sector_name = first_truthy(s, "sector_name", "sector", "name", default="")
                             importance = s.get("Sector_importance", "")
                             if sector_name and sector_name.strip():
                                 sectors.append({"sector": sector_name, "id": s.get("id", 0), "importance": importance})
@@ -2145,7 +2906,7 @@ async def refresh_db(payload: Dict[str, Any]) -> JSONResponse:
                             sectors.append({"sector": s})
 
             # Webpage monitored (press/news page URL)
-            webpage_monitored = company_info.get("webpage_monitored", "") or company_info.get("press_page_url", "") or company_info.get("news_url", "") or ""
+            webpage_monitored = first_truthy(company_info, "webpage_monitored", "press_page_url", "news_url", default="")
 
             db_overview = {
                 "name": name,
@@ -2169,70 +2930,89 @@ async def refresh_db(payload: Dict[str, Any]) -> JSONResponse:
                 "webpage_monitored": webpage_monitored,
             }
         except Exception as e:
-            print(f"[Xano] overview normalization error: {e}")
+            logger.warning("[Xano] overview normalization error: %s", e)
+    return db_overview
 
-    # 3) DB management roles (key people from Xano)
+
+def _build_db_management(db_company: Optional[dict]) -> List[dict]:
+    """Current then past management roles from a Xano company payload."""
+    # Note: Management roles are at ROOT level of db_company, not inside "Company"
+    db_management: List[dict] = []
     if db_company:
         try:
-            # Check both root level (correct) and Company level (fallback) for management roles
-            mgmt_current = (
-                db_company.get("Managmant_Roles_current") or 
-                db_company.get("Management_Roles_current") or
-                db_company.get("Company", {}).get("Managmant_Roles_current") or
-                db_company.get("Company", {}).get("Management_Roles_current") or
-                []
+            # Check both root level (correct) and Company level (fallback)
+            mgmt_current = first_truthy(
+                db_company, "Managmant_Roles_current", "Management_Roles_current"
+            ) or first_truthy(
+                db_company.get("Company", {}), "Managmant_Roles_current", "Management_Roles_current", default=[]
             )
-            for role in mgmt_current:
-                # Extract job titles from job_titles_id array
-                job_titles = []
-                job_titles_id = role.get("job_titles_id", [])
-                if isinstance(job_titles_id, list):
-                    for jt in job_titles_id:
-                        if isinstance(jt, dict):
-                            job_title = jt.get("job_title", "")
-                            if job_title:
-                                job_titles.append(job_title)
-
-                db_management.append({
-                    "Individual_text": role.get("Individual_text", ""),
-                    "name": role.get("Individual_text", role.get("advisor_individuals", "")),
-                    "position": ", ".join(job_titles) if job_titles else "",
-                    "job_titles_id": job_titles_id,
-                    "Status": role.get("Status", "Current"),
-                    "linkedin_url": "",  # Not available in this endpoint
-                    "current_employee_url": role.get("current_employer_url", ""),  # Note: Xano uses "current_employer_url"
-                    "individuals_id": role.get("individuals_id", 0),
-                    "role_id": role.get("id", 0),
-                })
-            # Past management roles - fix typo: should be "Management_Roles_past" not "Managmant_Roles_past"
-            mgmt_past = company_info.get("Management_Roles_past") or company_info.get("Managmant_Roles_past") or []
-            for role in mgmt_past:
-                # Extract job titles from job_titles_id array
-                job_titles = []
-                job_titles_id = role.get("job_titles_id", [])
-                if isinstance(job_titles_id, list):
-                    for jt in job_titles_id:
-                        if isinstance(jt, dict):
-                            job_title = jt.get("job_title", "")
-                            if job_title:
-                                job_titles.append(job_title)
-
-                db_management.append({
-                    "Individual_text": role.get("Individual_text", ""),
-                    "name": role.get("Individual_text", role.get("advisor_individuals", "")),
-                    "position": ", ".join(job_titles) if job_titles else "",
-                    "job_titles_id": job_titles_id,
-                    "Status": role.get("Status", "Past"),
-                    "linkedin_url": "",
-                    "current_employee_url": role.get("current_employer_url", ""),  # Note: Xano uses "current_employer_url"
-                    "individuals_id": role.get("individuals_id", 0),
-                    "role_id": role.get("id", 0),
-                })
-            print(f"[Xano] Found {len(db_management)} management roles")
+            # Past management roles - check root level first (correct), then Company level (fallback)
+            mgmt_past = first_truthy(
+                db_company, "Managmant_Roles_past", "Management_Roles_past"
+            ) or first_truthy(
+                db_company.get("Company", {}), "Managmant_Roles_past", "Management_Roles_past", default=[]
+            )
+            roles = chain(((role, "Current") for role in mgmt_current), ((role, "Past") for role in mgmt_past))
+            db_management = [_role_to_dict(role, status) for role, status in roles]
+            logger.debug("[Xano] Found %d management roles", len(db_management))
         except Exception as e:
-            print(f"[Xano] management extraction error: {e}")
+            logger.warning("[Xano] management extraction error: %s", e)
+    return db_management
+
+
+def _ndjson_line(obj: Dict[str, Any]) -> bytes:
+    """One NDJSON frame, encoded like ORJSONResponse does."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) + b"\n"
 
-    return JSONResponse(
+
+@app.post("/refresh_db", response_class=ORJSONResponse)
+async def refresh_db(payload: Dict[str, Any]) -> ORJSONResponse:
+    """
+    Body: { "query": "https://heliointelligence.com/" }
+
+    Returns ONLY database data (no AI re-analysis):
+    {
+      "existing_company": {...} or null,
+      "db_company": {...} or null,
+      "db_overview": {...},
+      "db_events": [...],
+      "db_management": [...],
+      "top_management": [],  // Empty since no AI analysis
+      "ai_events": [],       // Empty since no AI analysis
+      "missing_events": [],  // Empty since no AI analysis
+      "matched_events": []   // Empty since no AI analysis
+    }
+    """
+    query = (payload or {}).get("query", "").strip()
+    if not query:
+        return ORJSONResponse({"error": "Missing 'query' field"}, status_code=400)
+
+    # 1) Pre-check in Xano. This endpoint runs right after the UI saved to Xano, so it
+    # always reads fresh data and writes it back for the next /analyze
+    existing_company = await _xano_refreshed(
+        _XANO_COMPANY_CACHE,
+        ("url", _normalize_company_url_key(query)),
+        lambda: _check_company_by_url_uncached(query),
+    )
+    if not (existing_company and existing_company.get("id")):
+        # Unseen URL: nothing to normalize, answer with the empty skeleton
+        empty = _EMPTY_REFRESH_RESPONSE.copy()
+        empty["existing_company"] = existing_company
+        return ORJSONResponse(empty)
+
+    cid = existing_company["id"]
+    db_company, db_events = await asyncio.gather(
+        _xano_refreshed(_XANO_COMPANY_CACHE, ("id", str(cid)), lambda: _get_company_by_id_uncached(cid)),
+        _xano_refreshed(_XANO_EVENTS_CACHE, str(cid), lambda: _get_corporate_events_by_company_id_uncached(cid)),
+    )
+
+    # 2) DB overview (extract from db_company)
+    db_overview = _build_db_overview(db_company, query)
+
+    # 3) DB management roles (key people from Xano)
+    db_management = _build_db_management(db_company)
+
+    return ORJSONResponse(
         {
             "existing_company": existing_company,
             "db_company": db_company,
@@ -2248,33 +3028,32 @@ async def refresh_db(payload: Dict[str, Any]) -> JSONResponse:
     )
 
 
-@app.post("/analyze", response_class=JSONResponse)
-async def analyze(payload: Dict[str, Any]) -> JSONResponse:
-    """
-    Body: { "query": "https://heliointelligence.com/" }
+# /analyze LLM budget: a full event search, or a small gap-fill when Xano already has events
+AI_MAX_EVENTS = 20
+DB_GAP_FILL_MAX_EVENTS = 5
+DB_COMPLETE_MIN_EVENTS = 5
+_FULL_AI_PLAN = MappingProxyType({"skip_overview": False, "max_events": AI_MAX_EVENTS})
 
-    Returns JSON:
-    {
-      "existing_company": {...} or null,
-      "db_company": {...} or null,
-      "db_events": [...],
-      "ai_events": [...],
-      "missing_events": [...],
-      "matched_events": [...]
-    }
-    """
-    payload = payload or {}
-    query = payload.get("query", "").strip()
-    if not query:
-        return JSONResponse({"error": "Missing 'query' field"}, status_code=400)
 
-    raw_options = payload.get("options") or {}
-    if not isinstance(raw_options, dict):
-        raw_options = {}
+def _db_overview_complete(db_overview: Optional[dict]) -> bool:
+    """True when the DB profile already has what the AI overview would be compared against."""
+    return bool(db_overview) and all(db_overview.get(k) for k in ("city", "country", "description", "sectors"))
+
+
+async def _analyze_frames(query: str, raw_options: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    The /analyze pipeline as stage frames: {"stage": "db", ...} once Xano answers, then
+    {"stage": "ai", ...} once the LLM work finishes. Raises if the AI stage fails.
+    Shared by the JSON, NDJSON and background-job (SSE) entry points.
+    """
     include_overview = bool(raw_options.get("include_overview", True))
     include_events = bool(raw_options.get("include_events", True))
     include_individuals = bool(raw_options.get("include_individuals", True))
     include_counterparties = include_events and bool(raw_options.get("include_counterparties", True))
+    # Run the full LLM pipeline even when the DB already answers
+    force_ai = bool(raw_options.get("force_ai", False))
+    # Set once Xano answers; the AI tasks wait on it to skip/downsize work the DB already covers
+    ai_plan: Future = Future()
 
     def strip_counterparties_from_events(events: List[dict]) -> List[dict]:
         """Remove counterparty/advisor payloads when the user only wants event facts."""
@@ -2296,979 +3075,603 @@ async def analyze(payload: Dict[str, Any]) -> JSONResponse:
             cleaned.append(item)
         return cleaned
 
-    # 1) Pre-check in Xano
-    existing_company = check_company_by_url(query)
-    db_company = None
-    db_events: List[dict] = []
-
-    if existing_company and existing_company.get("id"):
-        cid = existing_company["id"]
-        db_company = get_company_by_id(cid)
-        if include_events:
-            db_events = get_corporate_events_by_company_id(cid)
-
-    # 2) AI company overview (summary + description)
-    # Extract company name from URL if needed
-    company_name = query
-    input_website = ""
-    if query.startswith("http://") or query.startswith("https://"):
-        input_website = query
-        # Extract domain name as company name hint
-        from urllib.parse import urlparse
-        parsed = urlparse(query)
-        domain = parsed.netloc.replace("www.", "")
-        # Use domain without TLD as company name hint
-        company_name = domain.split(".")[0].title()
-
-    ai_overview = {
-        "name": company_name,
-        "city": "",
-        "country": "",
-        "ownership": "",
-        "website": input_website or "",
-        "linkedin": "",
-        "description": "",
-    }
+    # Same company analysed within AI_CACHE_TTL: reuse wiki/summary/description
+    overview_cache_key = _ai_cache_key("overview", query)
+
+    def run_ai_stage() -> Dict[str, Any]:
+        """Blocking AI half of /analyze: LLM overview/events/people (independent of Xano)."""
+        # 2) AI company overview (summary + description)
+        # Extract company name from URL if needed
+        company_name = query
+        input_website = ""
+        domain = ""
+        if query.startswith(_HTTP_PREFIXES):
+            input_website = query
+            # Extract domain name as company name hint
+            domain = urllib.parse.urlsplit(query).netloc.replace("www.", "")
+            # Use domain without TLD as company name hint
+            company_name = domain.split(".")[0].title()
+
+        ai_overview = {
+            "name": company_name,
+            "city": "",
+            "country": "",
+            "ownership": "",
+            "website": input_website or "",
+            "linkedin": "",
+            "description": "",
+        }
     
-    # ========================================
-    # 🚀 PARALLEL AI TASKS - Run in parallel to save time
-    # ========================================
-    print(f"[AI] Starting parallel AI tasks for {query}...")
+        # ========================================
+        # 🚀 PARALLEL AI TASKS - Run in parallel to save time
+        # ========================================
+        logger.info("[AI] Starting parallel AI tasks for %s...", query)
     
-    # Helper functions for parallel execution
-    def task_overview():
-        """Generate company overview (summary + description)"""
-        try:
-            wiki_text = get_wikipedia_summary(query)
-
-            # Pre-fetch Yahoo Finance data so generate_summary can inject it into
-            # the LLM prompt context without making a second lookup.
-            # query may be a full URL; extract the bare company name so that
-            # lookup_ticker gets sensible SerpAPI queries (e.g. "equifax", not
-            # "https://www.equifax.com/").
-            _yf_name = query
-            if query.startswith(("http://", "https://")):
-                import urllib.parse as _urlparse
-                _domain = _urlparse.urlparse(query).netloc.replace("www.", "")
-                _yf_name = _domain.split(".")[0]  # "equifax" from "equifax.com"
-            yahoo_data = enrich_with_yahoo_finance(_yf_name, input_website or "")
-            if yahoo_data:
-                print(
-                    f"[Yahoo] EV=${yahoo_data.get('enterprise_value_m')}M, "
-                    f"Rev=${yahoo_data.get('revenue_m')}M, "
-                    f"EBITDA=${yahoo_data.get('ebitda_m')}M"
-                )
-            else:
-                print("[Yahoo] No data returned (private company or ticker not found)")
-
-            summary_md = generate_summary(query, text=wiki_text, yahoo_data=yahoo_data)
-            description_raw = generate_description(query, text=wiki_text, company_details=summary_md)
-            description = strip_marketing_phrases(description_raw)
-            return {"summary_md": summary_md, "description": description, "wiki_text": wiki_text}
-        except Exception as e:
-            print(f"[AI] Overview task error: {e}")
-            traceback.print_exc()
-            return {"summary_md": "", "description": "", "wiki_text": ""}
-
-    def task_events():
-        """Generate corporate events"""
-        try:
-            return generate_corporate_events(query, max_events=20) or []
-        except Exception as e:
-            print(f"[AI] Events task error: {e}")
-            return []
-
-    def task_management():
-        """Get top management"""
-        try:
-            mgmt_list, mgmt_text = get_top_management(query)
-            if mgmt_list and isinstance(mgmt_list, list):
-                return mgmt_list
-            return []
-        except Exception as e:
-            print(f"[AI] Management task error: {e}")
-            return []
-
-    # Run all AI tasks in parallel (overview first so ownership task can use description)
-    overview_result = {"summary_md": "", "description": "", "wiki_text": ""}
-    ai_events = []
-    top_management = []
-    ownership_result = {"ownership": "", "confidence": "Low", "reasoning": ""}
-
-    with ThreadPoolExecutor(max_workers=3) as executor:
-        futures = {}
-        if include_overview:
-            futures[executor.submit(task_overview)] = "overview"
-        if include_events:
-            futures[executor.submit(task_events)] = "events"
-        if include_individuals:
-            futures[executor.submit(task_management)] = "management"
-
-        # Collect overview first so we can launch ownership detection on the description
-        future_ownership = None
-        for future in as_completed(list(futures.keys())):
-            task_name = futures.get(future)
+        # Helper functions for parallel execution
+        def wait_ai_plan():
+            """Block until Xano has answered, then return the plan (only LLM calls wait on it)."""
+            try:
+                return ai_plan.result(timeout=30)
+            except Exception:
+                return _FULL_AI_PLAN
+
+        def task_overview():
+            """Generate company overview (summary + description)"""
+            # Looked up here, on a worker thread: the disk tier is a SQLite read
+            cached_overview = _ai_cache_get(overview_cache_key)
+            if cached_overview is not None:
+                logger.info("[AI] Overview cache hit for %s", query)
+                return cached_overview
             try:
-                if task_name == "overview":
-                    overview_result = future.result()
-                    print(f"[AI] ✅ Overview completed")
-                    # Launch ownership detection now that we have the description
-                    desc_for_ownership = overview_result.get("description", "")
-                    future_ownership = executor.submit(detect_ownership_from_description, desc_for_ownership)
-                elif task_name == "events":
-                    ai_events = future.result()
-                    print(f"[AI] ✅ Events completed ({len(ai_events)} found)")
-                elif task_name == "management":
-                    top_management = future.result()
-                    print(f"[AI] ✅ Management completed ({len(top_management)} found)")
+                # Wikipedia/Yahoo are fetched speculatively while Xano is still answering
+                wiki_text = get_wikipedia_summary(query)
+
+                # Pre-fetch Yahoo Finance data so generate_summary can inject it into
+                # the LLM prompt context without making a second lookup.
+                # query may be a full URL; extract the bare company name so that
+                # lookup_ticker gets sensible SerpAPI queries (e.g. "equifax", not
+                # "https://www.equifax.com/").
+                _yf_name = domain.split(".")[0] if input_website else query  # "equifax" from "equifax.com"
+                yahoo_data = enrich_with_yahoo_finance(_yf_name, input_website or "")
+                if yahoo_data:
+                    logger.debug(
+                        "[Yahoo] EV=$%sM, Rev=$%sM, EBITDA=$%sM",
+                        yahoo_data.get("enterprise_value_m"),
+                        yahoo_data.get("revenue_m"),
+                        yahoo_data.get("ebitda_m"),
+                    )
+                else:
+                    logger.debug("[Yahoo] No data returned (private company or ticker not found)")
+
+                if wait_ai_plan()["skip_overview"]:
+                    logger.info("[AI] DB profile complete for %s - skipping summary/description", query)
+                    return {"summary_md": "", "description": "", "wiki_text": wiki_text, "from_db": True}
+
+                summary_md = generate_summary(query, text=wiki_text, yahoo_data=yahoo_data)
+                description_raw = generate_description(query, text=wiki_text, company_details=summary_md)
+                description = strip_marketing_phrases(description_raw)
+                result = {"summary_md": summary_md, "description": description, "wiki_text": wiki_text}
+                # Only cache real output: the generators return "❌ ..." placeholders on failure
+                if summary_md and description and not (summary_md.startswith("❌") or description.startswith("❌")):
+                    _ai_cache_set(overview_cache_key, result)
+                return result
             except Exception as e:
-                print(f"[AI] Parallel task error: {e}")
-
-        # Collect ownership result (submitted after overview finished)
-        if future_ownership:
+                logger.warning("[AI] Overview task error: %s", e, exc_info=True)
+                return {"summary_md": "", "description": "", "wiki_text": ""}
+
+        def task_events():
+            """Generate corporate events"""
+            # A cached full-size search also covers a gap-fill, so check it before the plan is known
+            cached_events = _ai_cache_get(_ai_cache_key(f"events:{AI_MAX_EVENTS}", query))
+            if cached_events is not None:
+                logger.info("[AI] Events cache hit for %s", query)
+                return cached_events
+            max_events = wait_ai_plan()["max_events"]
+            events_cache_key = _ai_cache_key(f"events:{max_events}", query)
+            if max_events != AI_MAX_EVENTS:
+                cached_events = _ai_cache_get(events_cache_key)
+                if cached_events is not None:
+                    logger.info("[AI] Events cache hit for %s (gap-fill)", query)
+                    return cached_events
             try:
-                ownership_result = future_ownership.result(timeout=30)
-                print(f"[AI] ✅ Ownership detected: {ownership_result.get('ownership')} (confidence: {ownership_result.get('confidence')})")
+                events = generate_corporate_events(query, max_events=max_events) or []
+                if events:
+                    _ai_cache_set(events_cache_key, events)
+                return events
             except Exception as e:
-                print(f"[AI] Ownership detection error: {e}")
-
-    print(f"[AI] All parallel tasks completed")
-    
-    # Extract results from parallel execution
-    summary_md = overview_result.get("summary_md", "")
-    description = overview_result.get("description", "")
-    
-    try:
-        if not include_overview:
-            raise RuntimeError("overview skipped by profile options")
-        
-        print(f"[AI] Summary generated:\n{summary_md[:500]}...")
-
-        # Very light parsing from the markdown summary to structured fields
-        # We keep it simple: look for "- Website:", "- LinkedIn:", "- Headquarters:"
-        website = input_website  # Default to input URL if provided
-        linkedin = ""
-        press_page = ""
-        city = ""
-        country = ""
-        year_founded = ""
-        ceo = ""
-        ownership = ""
-        former_name = ""
-        investors = ""
-        investors_new_company: List[int] = []
-        investment = {
-            "last_investment_amount": "",
-            "last_investment_currency": "",
-            "last_investment_date": "",
-            "last_investment_source": "",
-        }
-        revenues = {
-            "revenues_m": "",
-            "rev_source": "",
-            "revenues_currency": "",
-            "years_id": "",
-        }
-        ev_data = {
-            "ev_value": "",
-            "ev_currency": "",
-            "ev_year": "",
-            "ev_source": "",
-        }
-        EBITDA = {
-            "EBITDA_m": "",
-            "EBITDA_source": "",
-            "EBITDA_currency": "",
-            "EBITDA_year": "",
-        }
-        ai_sectors: List[Dict[str, Any]] = []
-        primary_business_focus = ""
-        primary_business_focus_id = 0
-        
-        # Primary Business Focus mapping (name -> id)
-        # This maps AI-detected business focus to the predefined list with IDs
-        BUSINESS_FOCUS_MAP = {
-            "Financial Services": {"id": 74, "name": "Financial Services"},
-            "Data & Analytics": {"id": 75, "name": "Data & Analytics"},
-            "Software": {"id": 76, "name": "Software"},
-            "Business Services": {"id": 77, "name": "Business Services"},
-            "Consumer Internet": {"id": 78, "name": "Consumer Internet"},
-            "Consumer Media": {"id": 79, "name": "Consumer Media"},
-            "Aerospace": {"id": 80, "name": "Aerospace"},
-            "Food": {"id": 81, "name": "Food"},
-            "Insurance": {"id": 82, "name": "Insurance"},
-            "Satellites": {"id": 83, "name": "Satellites"},
-            "Events": {"id": 84, "name": "Events"},
-            "Retail": {"id": 85, "name": "Retail"},
-            "Wholesale": {"id": 86, "name": "Wholesale"},
-            "Industrials": {"id": 87, "name": "Industrials"},
-            "Agriculture": {"id": 88, "name": "Agriculture"},
-            "Telecommunications": {"id": 89, "name": "Telecommunications"},
-            "Healthcare": {"id": 90, "name": "Healthcare"},
-            "Law": {"id": 91, "name": "Law"},
-            "Pharmaceuticals": {"id": 92, "name": "Pharmaceuticals"},
-            "Education & Training": {"id": 93, "name": "Education & Training"},
-            "Real Estate": {"id": 94, "name": "Real Estate"},
-            "Defence": {"id": 95, "name": "Defence"},
-            "Entertainment": {"id": 96, "name": "Entertainment"},
-            "Medical Equipment": {"id": 97, "name": "Medical Equipment"},
-            "Laboratory Equipment": {"id": 98, "name": "Laboratory Equipment"},
-            "Shipping": {"id": 99, "name": "Shipping"},
-            "Academic Publishing": {"id": 100, "name": "Academic Publishing"},
-            "Trade Association": {"id": 101, "name": "Trade Association"},
-            "Fitness": {"id": 102, "name": "Fitness"},
-            "Chemicals": {"id": 103, "name": "Chemicals"},
-            "Not-for-Profit": {"id": 104, "name": "Not-for-Profit"},
-            "Semiconductors": {"id": 105, "name": "Semiconductors"},
-            "Natural Resources": {"id": 106, "name": "Natural Resources"},
-            "Power Generation": {"id": 107, "name": "Power Generation"},
-            "Consumer Electronics": {"id": 108, "name": "Consumer Electronics"},
-            "Energy & Commodities": {"id": 109, "name": "Energy & Commodities"},
-            "Crypto": {"id": 110, "name": "Crypto"},
-            "Engineering": {"id": 111, "name": "Engineering"},
-            "Aviation": {"id": 112, "name": "Aviation"},
-            "Automotive": {"id": 113, "name": "Automotive"},
-            "Digital Infrastructure": {"id": 114, "name": "Digital Infrastructure"},
-            "Professional Body": {"id": 115, "name": "Professional Body"},
-            "Manufacturing": {"id": 117, "name": "Manufacturing"},
-            "Marketplace": {"id": 118, "name": "Marketplace"},
-            "Business Media": {"id": 119, "name": "Business Media"},
-            "Government Agency": {"id": 120, "name": "Government Agency"},
-            "Real Estate Broker": {"id": 121, "name": "Real Estate Broker"},
-        }
-        
-        def map_business_focus(ai_value: str) -> tuple[str, int]:
-            """
-            Map AI-detected business focus to predefined list.
-            Returns (name, id) tuple.
-            """
-            if not ai_value or not is_valid_value(ai_value):
-                return ("", 0)
-            
-            ai_lower = ai_value.strip()
-            
-            # Try exact match first
-            for key, value in BUSINESS_FOCUS_MAP.items():
-                if key.lower() == ai_lower.lower():
-                    return (value["name"], value["id"])
-            
-            # Try fuzzy matching for common variations
-            fuzzy_matches = {
-                "fintech": "Financial Services",
-                "banking": "Financial Services",
-                "payments": "Financial Services",
-                "data analytics": "Data & Analytics",
-                "analytics": "Data & Analytics",
-                "big data": "Data & Analytics",
-                "saas": "Software",
-                "software as a service": "Software",
-                "enterprise software": "Software",
-                "b2b services": "Business Services",
-                "professional services": "Business Services",
-                "consulting": "Business Services",
-                "e-commerce": "Consumer Internet",
-                "online marketplace": "Marketplace",
-                "marketplace": "Marketplace",
-                "ecommerce": "Consumer Internet",
-                "pharma": "Pharmaceuticals",
-                "pharmaceutical": "Pharmaceuticals",
-                "drug development": "Pharmaceuticals",
-                "medical devices": "Medical Equipment",
-                "healthcare services": "Healthcare",
-                "health tech": "Healthcare",
-                "healthtech": "Healthcare",
-                "telecom": "Telecommunications",
-                "telecommunications": "Telecommunications",
-                "defense": "Defence",
-                "defence": "Defence",
-                "non-profit": "Not-for-Profit",
-                "nonprofit": "Not-for-Profit",
-                "nfp": "Not-for-Profit",
-                "energy": "Energy & Commodities",
-                "commodities": "Energy & Commodities",
-                "cryptocurrency": "Crypto",
-                "blockchain": "Crypto",
-                "real estate": "Real Estate",
-                "property": "Real Estate",
-            }
-            
-            for fuzzy_key, mapped_name in fuzzy_matches.items():
-                if fuzzy_key in ai_lower:
-                    mapped = BUSINESS_FOCUS_MAP.get(mapped_name)
-                    if mapped:
-                        return (mapped["name"], mapped["id"])
-            
-            # If no match found, return the AI value as-is with ID 0
-            print(f"[AI] Business focus '{ai_value}' not found in predefined list - using as-is")
-            return (ai_value.strip(), 0)
-        
-        # Country normalization mapping (DB standard names)
-        country_normalization = {
-            # UK variations
-            "england": "UK",
-            "scotland": "UK", 
-            "wales": "UK",
-            "northern ireland": "UK",
-            "britain": "UK",
-            "great britain": "UK",
-            "united kingdom": "UK",
-            "u.k.": "UK",
-            "u.k": "UK",
-            # USA variations
-            "united states": "USA",
-            "united states of america": "USA",
-            "america": "USA",
-            "us": "USA",
-            "u.s.": "USA",
-            "u.s.a.": "USA",
-            "u.s.a": "USA",
-            # UAE variations
-            "united arab emirates": "UAE",
-            "u.a.e.": "UAE",
-            # Other common normalizations
-            "the netherlands": "Netherlands",
-            "holland": "Netherlands",
-            "republic of ireland": "Ireland",
-            "south korea": "Korea",
-            "republic of korea": "Korea",
-        }
-        
-        def normalize_country(country_val: str) -> str:
-            """Normalize country name to DB standard"""
-            if not country_val:
-                return ""
-            normalized = country_normalization.get(country_val.lower().strip(), country_val)
-            return normalized
-        
-        # Valid ownership status values - comprehensive classification
-        valid_ownership_types = {
-            # Public vs Private
-            "public", "private",
-            # By Investor/Owner Type
-            "venture-backed", "private equity-backed", "family-owned",
-            "employee-owned", "founder-owned", "institutional-owned",
-            # Special Categories
-            "government-owned", "non-profit", "subsidiary",
-            "cooperative", "partnership"
-        }
-        
-        def strip_citations(val: str) -> str:
-            """Remove Perplexity/Sonar citation markers like [1], [2][3] from a value."""
-            if not isinstance(val, str):
-                return val
-            cleaned = re.sub(r'\[\d+\]', '', val)
-            return cleaned.strip()
-
-        def is_valid_value(val: str) -> bool:
-            """Check if value is valid (not empty or placeholder)."""
-            if not val:
-                return False
-            low = strip_citations(val).lower().strip()
-            invalid = {"not found", "unknown", "n/a", "none", "<value>", "", "-"}
-            return low not in invalid and not low.startswith("<")
-
-        def extract_url(text: str) -> str:
-            """Extract URL from text, stripping citations and handling markdown links."""
-            text = strip_citations(text)
-            # Handle markdown links like [text](url)
-            md_match = re.search(r'\[.*?\]\((https?://[^\)]+)\)', text)
-            if md_match:
-                return md_match.group(1)
-            # Handle plain URLs (stop before any citation bracket)
-            url_match = re.search(r'(https?://[^\s\)\[]+)', text)
-            if url_match:
-                return url_match.group(1).rstrip('.,;')
-            return text.strip()
-
-        def extract_year(text: str) -> str:
-            if not text:
-                return ""
-            match = re.search(r'\b(19|20)\d{2}\b', text)
-            return match.group(0) if match else text.strip()
-
-        def parse_integer_list(text: str) -> List[int]:
-            if not text:
+                logger.warning("[AI] Events task error: %s", e)
                 return []
-            return [int(x) for x in re.findall(r'\d+', text)]
-        
-        for line in (summary_md or "").splitlines():
-            # Strip Perplexity citation markers [1][2][3] so they never
-            # end up in parsed values or field-matching strings.
-            line = strip_citations(line)
-            low = line.lower().replace("–", "-").replace("—", "-")
-
-            if "website:" in low:
-                val = line.split(":", 1)[-1].strip()
-                url = extract_url(val)
-                if is_valid_value(url) and ("http://" in url or "https://" in url):
-                    website = url
-            elif "former name:" in low or "former names:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    former_name = val
-            elif "linkedin:" in low:
-                val = line.split(":", 1)[-1].strip()
-                url = extract_url(val)
-                if is_valid_value(url) and "linkedin.com" in url.lower():
-                    linkedin = url
-            elif "press page:" in low or "press-page:" in low or "presspage:" in low:
-                val = line.split(":", 1)[-1].strip()
-                url = extract_url(val)
-                if is_valid_value(url) and ("http://" in url or "https://" in url):
-                    if _is_press_section_url(url):
-                        press_page = url
-                    else:
-                        print(f"[PressPage] Rejected AI-suggested URL (looks like article, not section): {url}")
-            elif "headquarters:" in low:
-                hq = line.split(":", 1)[-1].strip()
-                if is_valid_value(hq):
-                    # Very rough split city / country by last comma
-                    if "," in hq:
-                        parts = [p.strip() for p in hq.split(",")]
-                        if len(parts) >= 2:
-                            city = ", ".join(parts[:-1])
-                            country = normalize_country(parts[-1])
-                        else:
-                            city = hq
-                    else:
-                        city = hq
-            elif "ownership status:" in low or "ownership:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    val_lower = val.lower().strip()
-                    
-                    # Smart matching for ownership types
-                    # Check for PUBLIC indicators first (most important distinction)
-                    public_indicators = ["public", "publicly traded", "publicly held", "listed", "nasdaq", "nyse", "lse", "stock exchange", "ipo"]
-                    if any(ind in val_lower for ind in public_indicators):
-                        ownership = "Public"
-                    # Check for PE-backed
-                    elif "private equity" in val_lower or "pe-backed" in val_lower or "pe backed" in val_lower:
-                        ownership = "Private Equity-Backed"
-                    # Check for VC-backed
-                    elif "venture" in val_lower or "vc-backed" in val_lower or "vc backed" in val_lower:
-                        ownership = "Venture-Backed"
-                    # Check for government
-                    elif "government" in val_lower or "state-owned" in val_lower or "state owned" in val_lower:
-                        ownership = "Government-Owned"
-                    # Check for non-profit
-                    elif "non-profit" in val_lower or "nonprofit" in val_lower or "not-for-profit" in val_lower:
-                        ownership = "Non-Profit"
-                    # Check for family
-                    elif "family" in val_lower:
-                        ownership = "Family-Owned"
-                    # Check for employee
-                    elif "employee" in val_lower or "esop" in val_lower:
-                        ownership = "Employee-Owned"
-                    # Check for founder
-                    elif "founder" in val_lower:
-                        ownership = "Founder-Owned"
-                    # Check for subsidiary
-                    elif "subsidiary" in val_lower or "owned by" in val_lower:
-                        ownership = "Subsidiary"
-                    # Check for institutional
-                    elif "institutional" in val_lower:
-                        ownership = "Institutional-Owned"
-                    # Check for partnership
-                    elif "partnership" in val_lower or "llp" in val_lower:
-                        ownership = "Partnership"
-                    # Check for cooperative
-                    elif "cooperative" in val_lower or "co-op" in val_lower:
-                        ownership = "Cooperative"
-                    # Default to Private if nothing else matches but it's clearly private
-                    elif "private" in val_lower:
-                        ownership = "Private"
-                    # Exact match fallback
-                    elif val_lower in valid_ownership_types:
-                        ownership = val.strip()
-                    else:
-                        # Log for debugging
-                        print(f"[AI] Unknown ownership value: '{val}' - defaulting to empty")
-            elif "primary business focus:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    mapped_name, mapped_id = map_business_focus(val)
-                    primary_business_focus = mapped_name
-                    primary_business_focus_id = mapped_id
-                    if mapped_id > 0:
-                        print(f"[AI] Mapped business focus '{val}' -> '{mapped_name}' (ID: {mapped_id})")
-                    else:
-                        print(f"[AI] Business focus '{val}' not mapped - using as-is")
-            elif "primary sectors:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    # Expect comma-separated list of sector names
-                    parts = [p.strip() for p in val.split(",") if p.strip()]
-                    for s in parts:
-                        ai_sectors.append({"sector": s, "importance": "Primary"})
-            elif "secondary sectors:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val) and val.lower().strip() not in ["none", "n/a", "unknown"]:
-                    parts = [p.strip() for p in val.split(",") if p.strip()]
-                    for s in parts:
-                        ai_sectors.append({"sector": s, "importance": "Secondary"})
-            elif "year founded:" in low or "- founded:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    year_match = re.search(r'(\d{4})', val)
-                    if year_match:
-                        year_founded = year_match.group(1)
-            elif "- ceo:" in low or line.strip().lower().startswith("ceo:"):
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    ceo = val
-            elif "investors:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    investors = val
-            elif "company name:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    company_name = val
-            elif "investors new company:" in low or "investor ids:" in low:
-                investors_new_company = parse_integer_list(line.split(":", 1)[-1].strip())
-            elif "last investment amount:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    investment["last_investment_amount"] = val
-            elif "last investment currency:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    investment["last_investment_currency"] = val.upper()
-            elif "last investment date:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    investment["last_investment_date"] = val
-            elif "last investment source:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    investment["last_investment_source"] = extract_url(val)
-            elif "revenues currency:" in low or "revenue currency:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    revenues["revenues_currency"] = val.upper()
-            elif "revenues year:" in low or "revenue year:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    revenues["years_id"] = extract_year(val)
-            elif "revenues source:" in low or "revenue source:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    revenues["rev_source"] = extract_url(val)
-            elif "revenues:" in low or "revenue:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    revenues["revenues_m"] = val
-            elif "enterprise value currency:" in low or "ev currency:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    ev_data["ev_currency"] = val.upper()
-            elif "enterprise value year:" in low or "ev year:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    ev_data["ev_year"] = extract_year(val)
-            elif "enterprise value source:" in low or "ev source:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    ev_data["ev_source"] = extract_url(val)
-            elif "enterprise value:" in low or "ev value:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    ev_data["ev_value"] = val
-            elif "ebitda currency:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    EBITDA["EBITDA_currency"] = val.upper()
-            elif "ebitda year:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    EBITDA["EBITDA_year"] = extract_year(val)
-            elif "ebitda source:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    EBITDA["EBITDA_source"] = extract_url(val)
-            elif "ebitda:" in low:
-                val = line.split(":", 1)[-1].strip()
-                if is_valid_value(val):
-                    EBITDA["EBITDA_m"] = val
-
-        # Always try web search to correct press page: prefer domain-based result
-        search_input = website or company_name
-        if search_input:
-            found_press = search_press_page(search_input, company_name)
-            if found_press:
-                press_page = found_press
-
-        # Auto-lookup state for US cities
-        state_province = ""
-        if city and country:
-            country_upper = country.upper().strip()
-            if country_upper in ['USA', 'US', 'UNITED STATES', 'UNITED STATES OF AMERICA', 'AMERICA']:
-                us_city_to_state = {
-                    'san francisco': 'California', 'los angeles': 'California', 'san diego': 'California',
-                    'san jose': 'California', 'oakland': 'California', 'palo alto': 'California',
-                    'mountain view': 'California', 'menlo park': 'California', 'cupertino': 'California',
-                    'sunnyvale': 'California', 'santa clara': 'California', 'redwood city': 'California',
-                    'irvine': 'California', 'santa monica': 'California', 'pasadena': 'California',
-                    'new york': 'New York', 'new york city': 'New York', 'nyc': 'New York', 'manhattan': 'New York',
-                    'brooklyn': 'New York', 'buffalo': 'New York',
-                    'seattle': 'Washington', 'bellevue': 'Washington', 'redmond': 'Washington',
-                    'boston': 'Massachusetts', 'cambridge': 'Massachusetts',
-                    'chicago': 'Illinois',
-                    'austin': 'Texas', 'dallas': 'Texas', 'houston': 'Texas', 'san antonio': 'Texas', 'plano': 'Texas',
-                    'denver': 'Colorado', 'boulder': 'Colorado',
-                    'atlanta': 'Georgia',
-                    'miami': 'Florida', 'tampa': 'Florida', 'orlando': 'Florida', 'jacksonville': 'Florida',
-                    'phoenix': 'Arizona', 'scottsdale': 'Arizona', 'tempe': 'Arizona',
-                    'portland': 'Oregon',
-                    'las vegas': 'Nevada', 'reno': 'Nevada',
-                    'salt lake city': 'Utah',
-                    'raleigh': 'North Carolina', 'charlotte': 'North Carolina', 'durham': 'North Carolina',
-                    'nashville': 'Tennessee',
-                    'detroit': 'Michigan', 'ann arbor': 'Michigan',
-                    'minneapolis': 'Minnesota', 'st paul': 'Minnesota',
-                    'philadelphia': 'Pennsylvania', 'pittsburgh': 'Pennsylvania',
-                    'washington': 'District of Columbia', 'washington dc': 'District of Columbia',
-                    'washington d.c.': 'District of Columbia', 'dc': 'District of Columbia',
-                    'arlington': 'Virginia', 'mclean': 'Virginia', 'reston': 'Virginia', 'alexandria': 'Virginia',
-                    'baltimore': 'Maryland', 'bethesda': 'Maryland',
-                    'indianapolis': 'Indiana',
-                    'columbus': 'Ohio', 'cleveland': 'Ohio', 'cincinnati': 'Ohio',
-                    'kansas city': 'Missouri', 'st louis': 'Missouri', 'st. louis': 'Missouri',
-                    'omaha': 'Nebraska',
-                    'new orleans': 'Louisiana',
-                    'milwaukee': 'Wisconsin', 'madison': 'Wisconsin',
-                    'hartford': 'Connecticut', 'stamford': 'Connecticut', 'greenwich': 'Connecticut',
-                    'providence': 'Rhode Island',
-                    'jersey city': 'New Jersey', 'newark': 'New Jersey', 'hoboken': 'New Jersey', 'princeton': 'New Jersey',
-                }
-                city_lower = city.lower().strip()
-                state_province = us_city_to_state.get(city_lower, "")
-                if state_province:
-                    print(f"[AI] 📍 Auto-detected state for {city}: {state_province}")
-
-        # Ownership: use the dedicated LLM-based detector result (runs in parallel above)
-        # It overrides whatever was parsed from summary_md — more accurate and consistent.
-        detected_ownership = ownership_result.get("ownership", "")
-        detected_confidence = ownership_result.get("confidence", "Low")
-        if detected_ownership:
-            ownership = detected_ownership
-            print(f"[AI] 🏷️ Ownership set by detector: {ownership} (confidence: {detected_confidence})")
 
-        ai_overview = {
-            "name": company_name,
-            "city": city,
-            "state_province": state_province,
-            "country": country,
-            "ownership": ownership,
-            "website": website,
-            "linkedin": linkedin,
-            "webpage_monitored": press_page,  # Press/news page URL
-            "description": description or "",
-            "year_founded": year_founded,
-            "ceo": ceo,
-            "former_name": former_name,
-            "investors": investors,
-            "investors_new_company": investors_new_company,
-            "investment": investment,
-            "revenues": revenues,
-            "ev_data": ev_data,
-            "EBITDA": EBITDA,
-            "sectors": ai_sectors,
-            "primary_business_focus": primary_business_focus,
-            "primary_business_focus_id": primary_business_focus_id,
-        }
-        print(f"[AI] Parsed overview: {ai_overview}")
-    except Exception as e:
-        if include_overview:
-            print(f"[AI] overview generation error: {e}")
-            traceback.print_exc()
-        else:
-            ai_overview = None
-
-    # 3) AI events - already fetched in parallel above
-
-    # 4) Simple matching (same as Streamlit gap analysis, simplified)
-    def normalize_text(text: str) -> str:
-        return (text or "").lower().strip()
-
-    def extract_keywords(text: str) -> set:
-        if not text:
-            return set()
-        stop_words = {
-            "the",
-            "a",
-            "an",
-            "and",
-            "or",
-            "to",
-            "of",
-            "in",
-            "for",
-            "with",
-            "by",
-            "from",
-            "its",
-            "as",
-        }
-        words = set(normalize_text(text).split())
-        return words - stop_words
-
-    def events_match(ai_event: dict, db_event: dict, threshold: float = 0.4) -> bool:
-        ai_name = ai_event.get("Event (short)", ai_event.get("event_short", ""))
-        db_name = db_event.get("description", "")
-        ai_keywords = extract_keywords(ai_name)
-        db_keywords = extract_keywords(db_name)
-        if not ai_keywords or not db_keywords:
-            return False
-        overlap = len(ai_keywords & db_keywords)
-        max_len = max(len(ai_keywords), len(db_keywords))
-        similarity = overlap / max_len if max_len > 0 else 0.0
-        return similarity >= threshold
-
-    matched_events: List[dict] = []
-    missing_events: List[dict] = []
-
-    if include_events and ai_events and db_events:
-        for ev in ai_events:
-            matched = any(events_match(ev, db_ev) for db_ev in db_events)
-            if matched:
-                matched_events.append(ev)
-            else:
-                missing_events.append(ev)
-    elif include_events:
-        missing_events = ai_events
+        def task_management():
+            """Get top management"""
+            mgmt_cache_key = _ai_cache_key("management", query)
+            cached_mgmt = _ai_cache_get(mgmt_cache_key)
+            if cached_mgmt is not None:
+                logger.info("[AI] Management cache hit for %s", query)
+                return cached_mgmt
+            try:
+                mgmt_list, mgmt_text = get_top_management(query)
+                if mgmt_list and isinstance(mgmt_list, list):
+                    _ai_cache_set(mgmt_cache_key, mgmt_list)
+                    return mgmt_list
+                return []
+            except Exception as e:
+                logger.warning("[AI] Management task error: %s", e)
+                return []
 
-    if include_events and not include_counterparties:
-        ai_events = strip_counterparties_from_events(ai_events)
-        db_events = strip_counterparties_from_events(db_events)
-        matched_events = strip_counterparties_from_events(matched_events)
-        missing_events = strip_counterparties_from_events(missing_events)
+        # Run all AI tasks in parallel (overview first so ownership task can use description)
+        overview_result = {"summary_md": "", "description": "", "wiki_text": ""}
+        ai_events = []
+        top_management = []
+        ownership_result = {"ownership": "", "confidence": "Low", "reasoning": ""}
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {}
+            if include_overview:
+                futures[executor.submit(task_overview)] = "overview"
+            if include_events:
+                futures[executor.submit(task_events)] = "events"
+            if include_individuals:
+                futures[executor.submit(task_management)] = "management"
+
+            # Collect overview first so we can launch ownership detection on the description
+            future_ownership = None
+            for future in as_completed(list(futures.keys())):
+                task_name = futures.get(future)
+                try:
+                    if task_name == "overview":
+                        overview_result = future.result()
+                        logger.info("[AI] ✅ Overview completed")
+                        # Launch ownership detection now that we have the description
+                        if not overview_result.get("from_db"):
+                            desc_for_ownership = overview_result.get("description", "")
+                            future_ownership = executor.submit(detect_ownership_from_description, desc_for_ownership)
+                    elif task_name == "events":
+                        ai_events = future.result()
+                        logger.info("[AI] ✅ Events completed (%d found)", len(ai_events))
+                    elif task_name == "management":
+                        top_management = future.result()
+                        logger.info("[AI] ✅ Management completed (%d found)", len(top_management))
+                except Exception as e:
+                    logger.warning("[AI] Parallel task error: %s", e)
 
-    # 4.5) Top Management - already fetched in parallel above
+            # Collect ownership result (submitted after overview finished)
+            if future_ownership:
+                try:
+                    ownership_result = future_ownership.result(timeout=30)
+                    logger.info(
+                        "[AI] ✅ Ownership detected: %s (confidence: %s)",
+                        ownership_result.get("ownership"),
+                        ownership_result.get("confidence"),
+                    )
+                except Exception as e:
+                    logger.warning("[AI] Ownership detection error: %s", e)
 
-    # 5) DB management roles (key people from Xano)
-    # Note: Management roles are at ROOT level of db_company, not inside "Company"
-    db_management = []
-    if include_individuals and db_company:
-        try:
-            # Check both root level (correct) and Company level (fallback)
-            mgmt_current = (
-                db_company.get("Managmant_Roles_current") or 
-                db_company.get("Management_Roles_current") or
-                db_company.get("Company", {}).get("Managmant_Roles_current") or
-                db_company.get("Company", {}).get("Management_Roles_current") or
-                []
-            )
-            for role in mgmt_current:
-                # Extract job titles from job_titles_id array
-                job_titles = []
-                job_titles_id = role.get("job_titles_id", [])
-                if isinstance(job_titles_id, list):
-                    for jt in job_titles_id:
-                        if isinstance(jt, dict):
-                            job_title = jt.get("job_title", "")
-                            if job_title:
-                                job_titles.append(job_title)
-                
-                db_management.append({
-                    "Individual_text": role.get("Individual_text", ""),
-                    "name": role.get("Individual_text", role.get("advisor_individuals", "")),
-                    "position": ", ".join(job_titles) if job_titles else "",
-                    "job_titles_id": job_titles_id,
-                    "Status": role.get("Status", "Current"),
-                    "linkedin_url": "",  # Not available in this endpoint
-                    "current_employee_url": role.get("current_employer_url", ""),  # Note: Xano uses "current_employer_url"
-                    "individuals_id": role.get("individuals_id", 0),
-                    "role_id": role.get("id", 0),
-                })
-            # Past management roles - check root level first (correct), then Company level (fallback)
-            mgmt_past = (
-                db_company.get("Managmant_Roles_past") or 
-                db_company.get("Management_Roles_past") or
-                db_company.get("Company", {}).get("Managmant_Roles_past") or
-                db_company.get("Company", {}).get("Management_Roles_past") or
-                []
-            )
-            for role in mgmt_past:
-                # Extract job titles from job_titles_id array
-                job_titles = []
-                job_titles_id = role.get("job_titles_id", [])
-                if isinstance(job_titles_id, list):
-                    for jt in job_titles_id:
-                        if isinstance(jt, dict):
-                            job_title = jt.get("job_title", "")
-                            if job_title:
-                                job_titles.append(job_title)
-                
-                db_management.append({
-                    "Individual_text": role.get("Individual_text", ""),
-                    "name": role.get("Individual_text", role.get("advisor_individuals", "")),
-                    "position": ", ".join(job_titles) if job_titles else "",
-                    "job_titles_id": job_titles_id,
-                    "Status": role.get("Status", "Past"),
-                    "linkedin_url": "",
-                    "current_employee_url": role.get("current_employer_url", ""),  # Note: Xano uses "current_employer_url"
-                    "individuals_id": role.get("individuals_id", 0),
-                    "role_id": role.get("id", 0),
-                })
-            print(f"[Xano] Found {len(db_management)} management roles")
-        except Exception as e:
-            print(f"[Xano] management extraction error: {e}")
+        logger.info("[AI] All parallel tasks completed")
 
-    # 6) DB overview (normalize to same structure as AI side)
-    db_overview = None
-    if include_overview and db_company:
+        if overview_result.get("from_db"):
+            # The caller mirrors db_overview; no summary to parse or press page to look up
+            return {
+                "ai_overview": None,
+                "ai_events": ai_events,
+                "top_management": top_management,
+                "overview_from_db": True,
+            }
+    
+        # Extract results from parallel execution
+        summary_md = overview_result.get("summary_md", "")
+        description = overview_result.get("description", "")
+    
         try:
-            company_info = db_company.get("Company", db_company)
-            name = company_info.get("name") or query
-            loc = company_info.get("_locations") or {}
-            city = loc.get("City", "")
-            country = loc.get("Country", "")
-            ownership_block = company_info.get("_ownership_type") or {}
-            ownership = ownership_block.get("ownership", "")
-            linkedin_block = company_info.get("linkedin_data") or {}
-            linkedin = linkedin_block.get("LinkedIn_URL", "")
-            website = company_info.get("url", "")
-            desc = company_info.get("description", "")
-
-            def parse_maybe_json(value):
-                if isinstance(value, str):
-                    try:
-                        return json.loads(value)
-                    except Exception:
-                        return value
-                return value
-
-            former_name = (
-                company_info.get("former_name")
-                or company_info.get("former_names")
-                or company_info.get("Former_Name")
-                or ""
-            )
-            investors_new_company = company_info.get("investors_new_company") or []
-            investment = parse_maybe_json(company_info.get("investment")) or {}
-            revenues = parse_maybe_json(company_info.get("revenues")) or {}
-            ev_data = parse_maybe_json(company_info.get("ev_data")) or {}
-            EBITDA = parse_maybe_json(company_info.get("EBITDA") or company_info.get("ebitda")) or {}
-            
-            # Year founded - check _years.Year first (proper structure), fallback to year_founded
-            years_block = company_info.get("_years") or {}
-            if isinstance(years_block, dict) and years_block.get("Year"):
-                year_founded = str(years_block.get("Year"))
-            else:
-                # Fallback to direct year_founded field (but ignore if it's just a reference ID like 10)
-                year_founded_raw = company_info.get("year_founded", 0)
-                # If year_founded is a 4-digit number (actual year), use it; otherwise treat as empty
-                if year_founded_raw and isinstance(year_founded_raw, (int, str)):
-                    year_str = str(year_founded_raw)
-                    if len(year_str) == 4 and year_str.isdigit():
-                        year_founded = year_str
-                    else:
-                        year_founded = ""
-                else:
-                    year_founded = ""
-            
-            # Primary business focus - can be nested object or direct reference
-            business_focus_block = company_info.get("primary_business_focus_id") or company_info.get("_primary_business_focus") or {}
-            if isinstance(business_focus_block, dict):
-                primary_business_focus = business_focus_block.get("business_focus", "") or business_focus_block.get("primary_business_focus", "") or business_focus_block.get("name", "")
-                primary_business_focus_id = business_focus_block.get("id", 0)
-            else:
-                primary_business_focus = ""
-                primary_business_focus_id = business_focus_block if isinstance(business_focus_block, int) else 0
-            
-            # Sectors - try new_sectors_data first (has actual sector names), fallback to sectors_id
-            sectors = []
-            primary_sectors = []
-            secondary_sectors = []
-            
-            # First check new_sectors_data (JSON string payload with real data)
-            new_sectors_data = company_info.get("new_sectors_data") or []
-            if isinstance(new_sectors_data, list) and len(new_sectors_data) > 0:
-                try:
-                    sectors_payload = new_sectors_data[0].get("sectors_payload", "")
-                    if sectors_payload:
-                        import json
-                        parsed_sectors = json.loads(sectors_payload)
-                        # Extract primary sectors
-                        for s in parsed_sectors.get("primary_sectors", []):
-                            if isinstance(s, dict) and s.get("sector_name"):
-                                primary_sectors.append({
-                                    "sector": s.get("sector_name"),
-                                    "id": s.get("id", 0),
-                                    "importance": "Primary"
-                                })
-                        # Extract secondary sectors
-                        for s in parsed_sectors.get("secondary_sectors", []):
-                            if isinstance(s, dict) and s.get("sector_name"):
-                                secondary_sectors.append({
-                                    "sector": s.get("sector_name"),
-                                    "id": s.get("id", 0),
-                                    "importance": "Secondary"
-                                })
-                        sectors = primary_sectors + secondary_sectors
-                except Exception as e:
-                    print(f"[Xano] new_sectors_data parse error: {e}")
-            
-            # Fallback to sectors_id if new_sectors_data didn't yield results
-            if not sectors:
-                sectors_data = company_info.get("sectors_id") or company_info.get("_sectors") or company_info.get("sectors") or []
-                if isinstance(sectors_data, list):
-                    for s in sectors_data:
-                        if isinstance(s, dict):
-                            sector_name = s.get("sector_name") or s.get("sector") or s.get("name", "")
-                            importance = s.get("Sector_importance", "")
-                            if sector_name and sector_name.strip():
-                                sectors.append({"sector": sector_name, "id": s.get("id", 0), "importance": importance})
-                        elif isinstance(s, str) and s.strip():
-                            sectors.append({"sector": s})
-            
-            # Webpage monitored (press/news page URL)
-            webpage_monitored = company_info.get("webpage_monitored", "") or company_info.get("press_page_url", "") or company_info.get("news_url", "") or ""
-            
-            db_overview = {
-                "name": name,
+            if not include_overview:
+                raise RuntimeError("overview skipped by profile options")
+        
+            logger.debug("[AI] Summary generated:\n%s", summary_md)
+
+            # Structured fields from the "- Label: value" lines of the markdown summary
+            summary_fields = parse_summary_md(summary_md)
+            website = summary_fields["website"] or input_website  # Default to input URL if provided
+            company_name = summary_fields["company_name"] or company_name
+            linkedin = summary_fields["linkedin"]
+            press_page = summary_fields["press_page"]
+            city = summary_fields["city"]
+            country = summary_fields["country"]
+            year_founded = summary_fields["year_founded"]
+            ceo = summary_fields["ceo"]
+            ownership = summary_fields["ownership"]
+            former_name = summary_fields["former_name"]
+            investors = summary_fields["investors"]
+            investors_new_company: List[int] = summary_fields["investors_new_company"]
+            investment = summary_fields["investment"]
+            revenues = summary_fields["revenues"]
+            ev_data = summary_fields["ev_data"]
+            EBITDA = summary_fields["EBITDA"]
+            ai_sectors: List[Dict[str, Any]] = summary_fields["ai_sectors"]
+            primary_business_focus = summary_fields["primary_business_focus"]
+            primary_business_focus_id = summary_fields["primary_business_focus_id"]
+
+            # Always try web search to correct press page: prefer domain-based result
+            search_input = website or company_name
+            if search_input:
+                found_press = search_press_page(search_input, company_name)
+                if found_press:
+                    press_page = found_press
+
+            # Auto-lookup state for US cities
+            state_province = ""
+            if city and country:
+                country_upper = country.upper().strip()
+                if country_upper in ['USA', 'US', 'UNITED STATES', 'UNITED STATES OF AMERICA', 'AMERICA']:
+                    us_city_to_state = {
+                        'san francisco': 'California', 'los angeles': 'California', 'san diego': 'California',
+                        'san jose': 'California', 'oakland': 'California', 'palo alto': 'California',
+                        'mountain view': 'California', 'menlo park': 'California', 'cupertino': 'California',
+                        'sunnyvale': 'California', 'santa clara': 'California', 'redwood city': 'California',
+                        'irvine': 'California', 'santa monica': 'California', 'pasadena': 'California',
+                        'new york': 'New York', 'new york city': 'New York', 'nyc': 'New York', 'manhattan': 'New York',
+                        'brooklyn': 'New York', 'buffalo': 'New York',
+                        'seattle': 'Washington', 'bellevue': 'Washington', 'redmond': 'Washington',
+                        'boston': 'Massachusetts', 'cambridge': 'Massachusetts',
+                        'chicago': 'Illinois',
+                        'austin': 'Texas', 'dallas': 'Texas', 'houston': 'Texas', 'san antonio': 'Texas', 'plano': 'Texas',
+                        'denver': 'Colorado', 'boulder': 'Colorado',
+                        'atlanta': 'Georgia',
+                        'miami': 'Florida', 'tampa': 'Florida', 'orlando': 'Florida', 'jacksonville': 'Florida',
+                        'phoenix': 'Arizona', 'scottsdale': 'Arizona', 'tempe': 'Arizona',
+                        'portland': 'Oregon',
+                        'las vegas': 'Nevada', 'reno': 'Nevada',
+                        'salt lake city': 'Utah',
+                        'raleigh': 'North Carolina', 'charlotte': 'North Carolina', 'durham': 'North Carolina',
+                        'nashville': 'Tennessee',
+                        'detroit': 'Michigan', 'ann arbor': 'Michigan',
+                        'minneapolis': 'Minnesota', 'st paul': 'Minnesota',
+                        'philadelphia': 'Pennsylvania', 'pittsburgh': 'Pennsylvania',
+                        'washington': 'District of Columbia', 'washington dc': 'District of Columbia',
+                        'washington d.c.': 'District of Columbia', 'dc': 'District of Columbia',
+                        'arlington': 'Virginia', 'mclean': 'Virginia', 'reston': 'Virginia', 'alexandria': 'Virginia',
+                        'baltimore': 'Maryland', 'bethesda': 'Maryland',
+                        'indianapolis': 'Indiana',
+                        'columbus': 'Ohio', 'cleveland': 'Ohio', 'cincinnati': 'Ohio',
+                        'kansas city': 'Missouri', 'st louis': 'Missouri', 'st. louis': 'Missouri',
+                        'omaha': 'Nebraska',
+                        'new orleans': 'Louisiana',
+                        'milwaukee': 'Wisconsin', 'madison': 'Wisconsin',
+                        'hartford': 'Connecticut', 'stamford': 'Connecticut', 'greenwich': 'Connecticut',
+                        'providence': 'Rhode Island',
+                        'jersey city': 'New Jersey', 'newark': 'New Jersey', 'hoboken': 'New Jersey', 'princeton': 'New Jersey',
+                    }
+                    city_lower = city.lower().strip()
+                    state_province = us_city_to_state.get(city_lower, "")
+                    if state_province:
+                        logger.debug("[AI] 📍 Auto-detected state for %s: %s", city, state_province)
+
+            # Ownership: use the dedicated LLM-based detector result (runs in parallel above)
+            # It overrides whatever was parsed from summary_md — more accurate and consistent.
+            detected_ownership = ownership_result.get("ownership", "")
+            detected_confidence = ownership_result.get("confidence", "Low")
+            if detected_ownership:
+                ownership = detected_ownership
+                logger.debug("[AI] 🏷️ Ownership set by detector: %s (confidence: %s)", ownership, detected_confidence)
+
+            ai_overview = {
+                "name": company_name,
                 "city": city,
+                "state_province": state_province,
                 "country": country,
                 "ownership": ownership,
                 "website": website,
                 "linkedin": linkedin,
-                "description": desc,
+                "webpage_monitored": press_page,  # Press/news page URL
+                "description": description or "",
                 "year_founded": year_founded,
+                "ceo": ceo,
                 "former_name": former_name,
+                "investors": investors,
                 "investors_new_company": investors_new_company,
                 "investment": investment,
                 "revenues": revenues,
                 "ev_data": ev_data,
                 "EBITDA": EBITDA,
+                "sectors": ai_sectors,
                 "primary_business_focus": primary_business_focus,
                 "primary_business_focus_id": primary_business_focus_id,
-                "sectors": sectors,
-                "webpage_monitored": webpage_monitored,
             }
+            logger.debug("[AI] Parsed overview: %s", ai_overview)
         except Exception as e:
-            print(f"[Xano] overview normalization error: {e}")
+            if include_overview:
+                logger.warning("[AI] overview generation error: %s", e, exc_info=True)
+            else:
+                ai_overview = None
 
-    return JSONResponse(
-        {
-            "existing_company": existing_company,
-            "db_company": db_company,
-            "db_overview": db_overview,
+        return {
             "ai_overview": ai_overview,
-            "db_events": db_events,
+            "ai_events": ai_events,
+            "top_management": top_management,
+            "overview_from_db": False,
+        }
+
+    def match_ai_events(generated: Dict[str, Any], db_events: List[dict]) -> Dict[str, Any]:
+        """Compare the generated AI events against the DB events (needs both halves)."""
+        ai_events = generated["ai_events"]
+
+        # 4) Simple matching (same as Streamlit gap analysis, simplified)
+        matched_events: List[dict] = []
+        missing_events: List[dict] = []
+
+        if include_events and ai_events and db_events:
+            matched_events, missing_events = split_matched_events(ai_events, db_events)
+        elif include_events:
+            missing_events = ai_events
+
+        if include_events and not include_counterparties:
+            ai_events = strip_counterparties_from_events(ai_events)
+            matched_events = strip_counterparties_from_events(matched_events)
+            missing_events = strip_counterparties_from_events(missing_events)
+
+        return {
+            "ai_overview": generated["ai_overview"],
             "ai_events": ai_events,
             "missing_events": missing_events,
             "matched_events": matched_events,
-            "top_management": top_management,
+            "top_management": generated["top_management"],
+        }
+
+    # The LLM work doesn't depend on Xano: start it now so it overlaps the DB reads
+    ai_task = asyncio.ensure_future(asyncio.to_thread(run_ai_stage))
+
+    # Cancelled if the consumer stops early (client gone): no orphaned, unretrieved AI task
+    try:
+        # 1) Pre-check in Xano
+        existing_company = None
+        db_company = None
+        db_events: List[dict] = []
+        db_overview = None
+        db_management: List[dict] = []
+        try:
+            existing_company = await check_company_by_url(query)
+            if existing_company and existing_company.get("id"):
+                cid = existing_company["id"]
+                if include_events:
+                    db_company, db_events = await asyncio.gather(
+                        get_company_by_id(cid),
+                        get_corporate_events_by_company_id(cid),
+                    )
+                else:
+                    db_company = await get_company_by_id(cid)
+
+            # DB side only needs the Xano payload, so it is ready before the AI work finishes
+            db_overview = _build_db_overview(db_company, query) if include_overview else None
+            db_management = _build_db_management(db_company) if include_individuals else []
+            if not force_ai:
+                ai_plan.set_result({
+                    "skip_overview": _db_overview_complete(db_overview),
+                    "max_events": (
+                        DB_GAP_FILL_MAX_EVENTS if len(db_events or ()) >= DB_COMPLETE_MIN_EVENTS else AI_MAX_EVENTS
+                    ),
+                })
+        finally:
+            if not ai_plan.done():
+                ai_plan.set_result(_FULL_AI_PLAN)
+
+        db_result = {
+            "existing_company": existing_company,
+            "db_company": db_company,
+            "db_overview": db_overview,
+            "db_events": (
+                strip_counterparties_from_events(db_events)
+                if include_events and not include_counterparties
+                else db_events
+            ),
             "db_management": db_management,
             "options": {
                 "include_overview": include_overview,
                 "include_events": include_events,
                 "include_individuals": include_individuals,
                 "include_counterparties": include_counterparties,
+                "force_ai": force_ai,
             },
         }
+
+        yield {"stage": "db", **db_result}
+        generated = await ai_task
+        ai_result = match_ai_events(generated, db_events)
+        if generated["overview_from_db"]:
+            # LLM overview skipped because the DB profile is complete: mirror it, marked as such
+            ai_result["ai_overview"] = {**db_overview, "source": "db"}
+        yield {"stage": "ai", **ai_result}
+    finally:
+        if not ai_task.done():
+            ai_task.cancel()
+
+
+def _analyze_request(payload: Optional[Dict[str, Any]]) -> tuple[str, Dict[str, Any]]:
+    """(query, options) from an /analyze-style body; query is "" when missing."""
+    payload = payload or {}
+    query = (payload.get("query") or "").strip()
+    raw_options = payload.get("options") or {}
+    if not isinstance(raw_options, dict):
+        raw_options = {}
+    return query, raw_options
+
+
+@app.post("/analyze", response_class=ORJSONResponse)
+async def analyze(payload: Dict[str, Any]) -> ORJSONResponse:
+    """
+    Body: { "query": "https://heliointelligence.com/" }
+
+    Returns JSON:
+    {
+      "existing_company": {...} or null,
+      "db_company": {...} or null,
+      "db_events": [...],
+      "ai_events": [...],
+      "missing_events": [...],
+      "matched_events": [...]
+    }
+
+    With "options": {"stream": true} the same keys arrive as NDJSON frames instead:
+    {"stage": "db", ...DB keys} as soon as Xano answers, then {"stage": "ai", ...AI keys}
+    (or {"stage": "error", "error": "..."}) once the LLM work finishes.
+    """
+    query, raw_options = _analyze_request(payload)
+    if not query:
+        return ORJSONResponse({"error": "Missing 'query' field"}, status_code=400)
+
+    frames = _analyze_frames(query, raw_options)
+    if raw_options.get("stream", False):
+        # NDJSON: the DB frame flushes right away, the AI frame follows once the LLMs finish
+        async def ndjson_frames():
+            try:
+                async for frame in frames:
+                    yield _ndjson_line(frame)
+            except Exception as e:
+                logger.warning("[AI] streamed analysis error: %s", e, exc_info=True)
+                yield _ndjson_line({"stage": "error", "error": str(e)})
+            finally:
+                # Runs on client disconnect too, so the pending AI task is cancelled
+                await frames.aclose()
+
+        return StreamingResponse(ndjson_frames(), media_type="application/x-ndjson")
+
+    result: Dict[str, Any] = {}
+    async for frame in frames:
+        result.update(frame)
+    result.pop("stage", None)
+    return ORJSONResponse(result)
+
+
+# ============================================================
+# 🔹 Background analysis jobs (POST starts, SSE/polling reads)
+# ============================================================
+# In-process registry: a job lives in the worker that started it, so the stream/poll
+# requests must reach the same process (single worker, or sticky routing).
+# Running jobs sit in a plain dict so they can't be evicted mid-run; finished jobs move
+# to the TTL cache and stay readable for ANALYZE_JOB_TTL seconds. At most
+# ANALYZE_MAX_RUNNING_JOBS run at once (each one is a full LLM pipeline); beyond that POST gets 429.
+ANALYZE_JOB_TTL = 15 * 60
+ANALYZE_MAX_RUNNING_JOBS = int(os.getenv("ANALYZE_MAX_RUNNING_JOBS", "8"))
+ANALYZE_STREAM_KEEPALIVE = 10.0
+_ANALYZE_JOBS_RUNNING: Dict[str, Dict[str, Any]] = {}
+_ANALYZE_JOBS: TTLCache = TTLCache(maxsize=256, ttl=ANALYZE_JOB_TTL)
+
+
+def _get_analyze_job(job_id: str) -> Optional[Dict[str, Any]]:
+    return _ANALYZE_JOBS_RUNNING.get(job_id) or _ANALYZE_JOBS.get(job_id)
+
+
+def _notify_analyze_job(job: Dict[str, Any]) -> None:
+    """Wake every stream waiting on this job and arm a fresh event for the next change."""
+    changed = job["changed"]
+    job["changed"] = asyncio.Event()
+    changed.set()
+
+
+def _finish_analyze_job(job_id: str, task: "asyncio.Future") -> None:
+    """Done-callback: retrieve the task outcome, record any error, retire the job to the TTL cache."""
+    job = _ANALYZE_JOBS_RUNNING.pop(job_id, None)
+    if job is None:
+        return
+    if task.cancelled():
+        error = "cancelled"
+    else:
+        exc = task.exception()
+        error = str(exc) if exc is not None else None
+    if error and not job.get("error"):
+        job["error"] = error
+        job["frames"].append({"stage": "error", "error": error})
+    job["done"] = True
+    _ANALYZE_JOBS[job_id] = job
+    _notify_analyze_job(job)
+
+
+async def _run_analyze_job(job: Dict[str, Any], query: str, raw_options: Dict[str, Any]) -> None:
+    try:
+        async for frame in _analyze_frames(query, raw_options):
+            job["frames"].append(frame)
+            _notify_analyze_job(job)
+    except Exception as e:
+        logger.warning("[AI] background analysis error: %s", e, exc_info=True)
+        job["error"] = str(e)
+        job["frames"].append({"stage": "error", "error": str(e)})
+    finally:
+        job["done"] = True
+        _notify_analyze_job(job)
+
+
+@app.post("/analyze/jobs", response_class=ORJSONResponse)
+async def analyze_job_start(payload: Dict[str, Any]) -> ORJSONResponse:
+    """
+    Same body as /analyze, but returns {"job_id": "..."} immediately (202) and runs the
+    analysis in the background. Read it with GET /analyze/stream/{job_id} (SSE: "db" then
+    "ai" or "error" events) or poll GET /analyze/jobs/{job_id}. Answers 429 while
+    ANALYZE_MAX_RUNNING_JOBS jobs are already running.
+    """
+    query, raw_options = _analyze_request(payload)
+    if not query:
+        return ORJSONResponse({"error": "Missing 'query' field"}, status_code=400)
+
+    if len(_ANALYZE_JOBS_RUNNING) >= ANALYZE_MAX_RUNNING_JOBS:
+        return ORJSONResponse(
+            {"error": "Too many analyses running, retry shortly"},
+            status_code=429,
+            headers={"Retry-After": "30"},
+        )
+
+    job_id = uuid.uuid4().hex
+    job: Dict[str, Any] = {"frames": [], "done": False, "changed": asyncio.Event()}
+    _ANALYZE_JOBS_RUNNING[job_id] = job
+    # Holding the task on the job keeps it referenced until it finishes
+    job["task"] = asyncio.ensure_future(_run_analyze_job(job, query, raw_options))
+    job["task"].add_done_callback(partial(_finish_analyze_job, job_id))
+    return ORJSONResponse({"job_id": job_id}, status_code=202)
+
+
+@app.get("/analyze/jobs/{job_id}", response_class=ORJSONResponse)
+async def analyze_job_status(job_id: str) -> ORJSONResponse:
+    """Polling view of a job: its status plus every key produced so far."""
+    job = _get_analyze_job(job_id)
+    if job is None:
+        return ORJSONResponse({"error": "Unknown or expired job_id"}, status_code=404)
+    result: Dict[str, Any] = {}
+    for frame in job["frames"]:
+        result.update(frame)
+    result.pop("stage", None)
+    return ORJSONResponse({"job_id": job_id, "status": "done" if job["done"] else "running", **result})
+
+
+@app.get("/analyze/stream/{job_id}")
+async def analyze_job_stream(job_id: str, request: Request):
+    """Server-sent events for a job: one event per stage frame, replayed from the start."""
+    job = _get_analyze_job(job_id)
+    if job is None:
+        return ORJSONResponse({"error": "Unknown or expired job_id"}, status_code=404)
+
+    async def sse_events():
+        sent = 0
+        while True:
+            # Grab the event before draining so a frame added meanwhile still wakes us
+            changed = job["changed"]
+            frames = job["frames"]
+            while sent < len(frames):
+                frame = frames[sent]
+                sent += 1
+                yield f"event: {frame.get('stage', 'message')}\ndata: ".encode() + orjson.dumps(
+                    frame, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                ) + b"\n\n"
+            if job["done"]:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=ANALYZE_STREAM_KEEPALIVE)
+            except asyncio.TimeoutError:
+                # Quiet stretch (LLMs still running): stop if the client left, else keep the pipe warm
+                if await request.is_disconnected():
+                    return
+                yield b": keepalive\n\n"
+
+    return StreamingResponse(
+        sse_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 